@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2026 Thomas Reifenberger.
+#
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+#
+"""
+End-to-end throughput benchmark of flowgraphs with the blocks of this module, fed with synthetic traffic as fast as
+possible. Reports the sustained sample rate and the CPU time spent in each block as JSON. If a baseline from an
+earlier run is given, the results are compared with it and the exit code is 1 if any flowgraph got slower.
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+
+import numpy
+
+import pmt
+from gnuradio import blocks, gr
+
+import binary_decoder
+from binary_decoder import synthetic_traffic
+
+# typical sample rates of our receivers, to report whether a flowgraph keeps up with them
+SAMPLE_RATES = (250e3, 1e6, 2.4e6, 10e6)
+
+
+class CpuTimer:
+    """
+    Wraps the work functions and message handlers of blocks to sum up the CPU time of the threads they run in.
+    """
+
+    def __init__(self):
+        self.seconds = {}
+
+    def wrap_work(self, name, block):
+        for method in ['work', 'general_work']:
+            if hasattr(block, method):
+                setattr(block, method, self._timed(name, getattr(block, method)))
+
+    def wrap_message_handler(self, name, block, port, handler):
+        block.set_msg_handler(pmt.intern(port), self._timed(name, handler))
+
+    def _timed(self, name, function):
+        self.seconds[name] = 0.
+
+        def timed_function(*args):
+            start = time.thread_time()
+            try:
+                return function(*args)
+            finally:
+                self.seconds[name] += time.thread_time() - start
+
+        return timed_function
+
+
+class benchmark_flowgraph(gr.top_block):
+    """
+    Source of synthetic traffic followed by the blocks returned by make_blocks(timer). A density of 0 means no
+    traffic at all, which is fed from a null source.
+    """
+
+    def __init__(self, make_blocks, burst, samples, density, timer):
+        gr.top_block.__init__(self, "binary_benchmark_flowgraph")
+        if density > 0:
+            # the traffic repeats after a fixed number of samples, to keep the vector source small
+            traffic = synthetic_traffic.traffic(burst, min(samples, 1 << 22), density)
+            source = blocks.vector_source_b(traffic.astype(numpy.uint8).tolist(), repeat=True)
+        else:
+            source = blocks.null_source(gr.sizeof_char)
+        head = blocks.head(gr.sizeof_char, samples)
+        self.connect(source, head)
+
+        previous = head
+        for block in make_blocks(timer):
+            if isinstance(block, tuple):
+                previous_port, block, port = block
+                self.msg_connect(previous, previous_port, block, port)
+            else:
+                self.connect(previous, block)
+            previous = block
+        if not isinstance(block, binary_decoder.binary_message_debug_sink):
+            self.connect(previous, blocks.null_sink(gr.sizeof_char))
+
+
+def tagger(timer):
+    block = binary_decoder.binary_tagger(max_quiet_samples=100)
+    timer.wrap_work('binary_tagger', block)
+    return [block]
+
+
+def symbol_sync(timer):
+    block = binary_decoder.binary_symbol_sync(samples_per_symbol=10)
+    timer.wrap_work('binary_symbol_sync', block)
+    return [block]
+
+
+def dppm_decoder(timer):
+    block = binary_decoder.binary_dppm_decoder(samples_per_pulse=10, samples_per_gap=(10, 20))
+    timer.wrap_work('binary_dppm_decoder', block)
+    return [block]
+
+
+def message_blocks(timer, pdu_port):
+    processor = binary_decoder.binary_message_processor(in_type=binary_decoder.MessageType.PDU,
+                                                        out_type=binary_decoder.MessageType.PDU,
+                                                        code='return tags, data')
+    timer.wrap_message_handler('binary_message_processor', processor, 'in', processor._handle_message)
+    debug_sink = binary_decoder.binary_message_debug_sink()
+    timer.wrap_message_handler('binary_message_debug_sink', debug_sink, 'pdu_in', debug_sink._handle_pdu_message)
+    return [(pdu_port, processor, 'in'), ('out', debug_sink, 'pdu_in')]
+
+
+def symbol_sync_chain(timer):
+    # the symbols of each call are collected into PDUs of a fixed length, as the block does not find packets
+    return tagger(timer) + symbol_sync(timer) + [
+        blocks.stream_to_tagged_stream(gr.sizeof_char, 1, 64, 'packet_len'),
+        blocks.tagged_stream_to_pdu(blocks.byte_t, 'packet_len'),
+    ] + message_blocks(timer, 'pdus')
+
+
+def dppm_chain(timer):
+    decoder = binary_decoder.binary_dppm_decoder(samples_per_pulse=10, samples_per_gap=(10, 20),
+                                                 stream_output=False, pdu_output=True)
+    timer.wrap_work('binary_dppm_decoder', decoder)
+    return tagger(timer) + [decoder] + message_blocks(timer, 'pdu')
+
+
+FLOWGRAPHS = {
+    'binary_tagger': (tagger, synthetic_traffic.ook_burst),
+    'binary_symbol_sync': (symbol_sync, synthetic_traffic.ook_burst),
+    'binary_dppm_decoder': (dppm_decoder, synthetic_traffic.dppm_burst),
+    'symbol_sync_chain': (symbol_sync_chain, synthetic_traffic.ook_burst),
+    'dppm_chain': (dppm_chain, synthetic_traffic.dppm_burst),
+}
+
+
+def run_benchmark(name, density, samples):
+    make_blocks, burst = FLOWGRAPHS[name]
+    timer = CpuTimer()
+    tb = benchmark_flowgraph(make_blocks, burst, samples, density, timer)
+    # the debug sink prints every message
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        start_cpu = time.process_time()
+        start = time.perf_counter()
+        tb.run()
+        seconds = time.perf_counter() - start
+        cpu_seconds = time.process_time() - start_cpu
+    sample_rate = samples / seconds
+    return {
+        'flowgraph': name,
+        'density': density,
+        'samples': samples,
+        'seconds': seconds,
+        'msps': sample_rate / 1e6,
+        'max_sample_rate': sample_rate,
+        'keeps_up_with': [rate for rate in SAMPLE_RATES if rate <= sample_rate],
+        'cpu_seconds': cpu_seconds,
+        'block_cpu_seconds': timer.seconds,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Returns a report line for each result with a baseline and whether any of them is a regression."""
+    baseline_msps = {(result['flowgraph'], result['density']): result['msps'] for result in baseline['results']}
+    lines = []
+    has_regression = False
+    for result in results:
+        key = (result['flowgraph'], result['density'])
+        if key not in baseline_msps:
+            lines.append(f'{result["flowgraph"]:<20} {result["density"]:>8} {result["msps"]:10.3f} Msps  no baseline')
+            continue
+        change = result['msps'] / baseline_msps[key] - 1
+        is_regression = change < -tolerance
+        has_regression |= is_regression
+        lines.append(f'{result["flowgraph"]:<20} {result["density"]:>8} {result["msps"]:10.3f} Msps '
+                     f'{baseline_msps[key]:10.3f} Msps {change:+8.1%}{"  REGRESSION" if is_regression else ""}')
+    return lines, has_regression
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--flowgraphs', nargs='+', choices=list(FLOWGRAPHS), default=list(FLOWGRAPHS),
+                        help='flowgraphs to benchmark (default: all)')
+    parser.add_argument('--densities', type=float, nargs='+', default=(0.,) + synthetic_traffic.DENSITIES,
+                        help='fractions of samples that belong to bursts (default: %(default)s)')
+    parser.add_argument('--samples', type=int, default=1 << 24,
+                        help='samples per benchmark (default: %(default)s)')
+    parser.add_argument('-o', '--output', type=argparse.FileType('w'), default=sys.stdout,
+                        help='output file for the results (default: stdout)')
+    parser.add_argument('--baseline', type=argparse.FileType('r'),
+                        help='results of an earlier run to compare with')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help='relative slowdown that is not yet a regression (default: %(default)s)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = [run_benchmark(name, density, args.samples) for name in args.flowgraphs for density in args.densities]
+    json.dump({
+        'gnuradio': gr.version(),
+        'python': sys.version.split()[0],
+        'numpy': numpy.__version__,
+        'results': results,
+    }, args.output, indent=2)
+    args.output.write('\n')
+
+    if args.baseline is not None:
+        lines, has_regression = compare(results, json.load(args.baseline), args.tolerance)
+        print(f'{"flowgraph":<20} {"density":>8} {"current":>15} {"baseline":>15} {"change":>8}', file=sys.stderr)
+        print('\n'.join(lines), file=sys.stderr)
+        if has_regression:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2026 Thomas Reifenberger.
+#
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+#
+"""
+Decode a file with one sample per byte (e.g. written by a file sink after thresholding) without running a flowgraph.
+Prints one line per packet: its sample offset, followed by the packet as hex. Symbol sync packets are whole
+transmissions, DPPM packets start at their first pulse. With - as input, the samples are decoded from stdin as they
+arrive, e.g. from a pipe.
+"""
+import argparse
+import asyncio
+import functools
+import sys
+
+from binary_decoder.async_pipeline import read_chunks_async, run_pipeline
+from binary_decoder.offline_decoder import DEFAULT_CHUNK_SIZE, decode_dppm, decode_file, decode_symbols, \
+    format_packet
+from binary_decoder.pipeline import bursts, dppm_packets, symbol_packets
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('input', help='file with one int8 sample per byte, non-zero samples are signal, '
+                                      'or - for stdin')
+    parser.add_argument('-o', '--output', type=argparse.FileType('w'), default=sys.stdout,
+                        help='output file (default: stdout)')
+    parser.add_argument('--max-quiet-samples', type=int, default=100,
+                        help='quiet samples after which a transmission ends (default: %(default)s)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help='samples scanned for transmissions at once (default: %(default)s)')
+    parser.add_argument('--bytes-per-sep', type=int, default=1,
+                        help='bytes between separators in the hex output (default: %(default)s)')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='decode in this many processes, split at quiet gaps (default: %(default)s)')
+    subparsers = parser.add_subparsers(dest='decoder', required=True)
+
+    symbol_sync = subparsers.add_parser('symbol_sync', help='decode like binary_symbol_sync')
+    symbol_sync.add_argument('--samples-per-symbol', type=int, default=10)
+    symbol_sync.add_argument('--max-deviation', type=int, default=2)
+    symbol_sync.add_argument('--clock-smoothing-factor', type=float, default=0.5)
+    symbol_sync.add_argument('--max-zero-symbols', type=int, default=10)
+    symbol_sync.add_argument('--output-samples-per-symbol', type=int, default=1)
+
+    dppm = subparsers.add_parser('dppm', help='decode like binary_dppm_decoder')
+    dppm.add_argument('--samples-per-pulse', type=int, default=10)
+    dppm.add_argument('--samples-per-gap', type=int, nargs='+', default=[10, 20])
+    dppm.add_argument('--max-deviation', type=int, default=1)
+    dppm.add_argument('--max-packet-length', type=int, default=64)
+    dppm.add_argument('--max-queued-symbols', type=int, default=65536)
+    args = parser.parse_args(argv)
+    if args.input == '-' and args.jobs != 1:
+        parser.error('--jobs is not supported for stdin')
+    return args
+
+
+def get_parameters(args):
+    if args.decoder == 'symbol_sync':
+        return dict(samples_per_symbol=args.samples_per_symbol,
+                    max_deviation=args.max_deviation,
+                    clock_smoothing_factor=args.clock_smoothing_factor,
+                    max_zero_symbols=args.max_zero_symbols,
+                    output_samples_per_symbol=args.output_samples_per_symbol)
+    return dict(samples_per_pulse=args.samples_per_pulse,
+                samples_per_gap=tuple(args.samples_per_gap),
+                max_deviation=args.max_deviation,
+                max_packet_length=args.max_packet_length,
+                max_queued_symbols=args.max_queued_symbols)
+
+
+def get_decode(args):
+    return functools.partial(decode_symbols if args.decoder == 'symbol_sync' else decode_dppm, **get_parameters(args))
+
+
+def decode_stdin(args):
+    packets = symbol_packets if args.decoder == 'symbol_sync' else dppm_packets
+
+    def stages(chunks):
+        # long transmissions are split into several bursts, which the packet stages decode as a whole
+        return packets(bursts(chunks, args.max_quiet_samples), **get_parameters(args))
+
+    async def print_packet(result):
+        print(format_packet(*result, args.bytes_per_sep), file=args.output, flush=True)
+
+    asyncio.run(run_pipeline(read_chunks_async(sys.stdin.buffer, args.chunk_size), stages, [print_packet]))
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.input == '-':
+        decode_stdin(args)
+        return
+    for offset, packet in decode_file(args.input, get_decode(args), args.max_quiet_samples, args.chunk_size,
+                                      args.jobs):
+        print(format_packet(offset, packet, args.bytes_per_sep), file=args.output)
+
+
+if __name__ == '__main__':
+    main()
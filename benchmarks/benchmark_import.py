@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2026 Thomas Reifenberger.
+#
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+#
+"""
+Measures how long it takes to import the package, each time in a fresh Python process. Besides the plain import,
+it measures typical first uses and, for comparison, the import of all blocks as the package did before it loaded
+them lazily. Prints the results as JSON.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+SCENARIOS = {
+    'import binary_decoder': 'import binary_decoder',
+    'kernels': 'from binary_decoder.kernels import DppmDecoder',
+    'offline_decoder': 'from binary_decoder.offline_decoder import decode_file',
+    'one block': 'import binary_decoder; binary_decoder.binary_dppm_decoder',
+    'all blocks (eager import)':
+        'import binary_decoder; [getattr(binary_decoder, name) for name in binary_decoder.__all__]',
+}
+
+MEASUREMENT = '''
+import sys, time
+start = time.perf_counter()
+exec(sys.argv[1])
+seconds = time.perf_counter() - start
+print(seconds, 'gnuradio' in sys.modules)
+'''
+
+
+def measure(statement):
+    output = subprocess.run([sys.executable, '-c', MEASUREMENT, statement], check=True, capture_output=True,
+                            text=True).stdout.split()
+    return float(output[0]), output[1] == 'True'
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=10,
+                        help='processes per scenario, the median is reported (default: %(default)s)')
+    parser.add_argument('-o', '--output', type=argparse.FileType('w'), default=sys.stdout,
+                        help='output file (default: stdout)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = []
+    for name, statement in SCENARIOS.items():
+        measurements = [measure(statement) for _ in range(args.repeat)]
+        results.append({
+            'scenario': name,
+            'statement': statement,
+            'median_ms': statistics.median(seconds for seconds, _ in measurements) * 1e3,
+            'min_ms': min(seconds for seconds, _ in measurements) * 1e3,
+            'loads_gnuradio': measurements[0][1],
+        })
+    json.dump({'python': sys.version.split()[0], 'results': results}, args.output, indent=2)
+    args.output.write('\n')
+
+
+if __name__ == '__main__':
+    main()
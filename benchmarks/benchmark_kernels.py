@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright 2026 Thomas Reifenberger.
+#
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+#
+"""
+Micro-benchmark of the Python kernels of the blocks. Instead of running a flowgraph, work/general_work is called
+directly with preallocated buffers, while nitems_read, consume, add_item_tag and friends are replaced by a fake
+scheduler context. Prints the results as JSON.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy
+
+import binary_decoder
+from binary_decoder import synthetic_traffic
+
+
+class FakeContext:
+    """Replaces the scheduler related methods of a block instance by a minimal bookkeeping of its own."""
+
+    def __init__(self, block):
+        self.nread = 0
+        self.nwritten = 0
+        self.consumed = 0
+        self.tags = 0
+        self.messages = 0
+        block.nitems_read = lambda port: self.nread
+        block.nitems_written = lambda port: self.nwritten
+        block.consume = self._consume
+        block.consume_each = lambda n: self._consume(0, n)
+        block.add_item_tag = self._add_item_tag
+        block.message_port_pub = self._message_port_pub
+
+    def _consume(self, port, n):
+        self.consumed = int(n)
+
+    def _add_item_tag(self, *args):
+        self.tags += 1
+
+    def _message_port_pub(self, port, message):
+        self.messages += 1
+
+
+def sync_calls(block, context, samples, buffer_size):
+    """Yields one call of work for each buffer_size samples."""
+    out0 = numpy.zeros(buffer_size, dtype=numpy.int8)
+    for position in range(0, len(samples), buffer_size):
+        in0 = samples[position:position + buffer_size]
+        context.nread = context.nwritten = position
+        yield lambda: block.work([in0], [out0[:len(in0)]])
+
+
+def general_calls(block, context, samples, buffer_size):
+    """Yields calls of general_work with up to buffer_size samples, as long as the block makes progress."""
+    out0 = numpy.zeros(buffer_size, dtype=numpy.int8)
+    position = 0
+    while True:
+        in0 = samples[position:position + buffer_size]
+        context.nread = position
+        context.consumed = 0
+        produced = []
+        yield lambda: produced.append(block.general_work([in0], [out0]))
+        if context.consumed == 0 and produced[0] == 0:
+            return
+        position += context.consumed
+        context.nwritten += produced[0]
+
+
+BENCHMARKS = {
+    'binary_tagger': (lambda: binary_decoder.binary_tagger(max_quiet_samples=100),
+                      synthetic_traffic.ook_burst, sync_calls),
+    'binary_symbol_sync': (lambda: binary_decoder.binary_symbol_sync(samples_per_symbol=10),
+                           synthetic_traffic.ook_burst, general_calls),
+    'binary_dppm_decoder': (lambda: binary_decoder.binary_dppm_decoder(samples_per_pulse=10, samples_per_gap=(10, 20)),
+                            synthetic_traffic.dppm_burst, general_calls),
+}
+
+
+def run_benchmark(name, density, samples, buffer_size, repeat):
+    make_block, burst, calls = BENCHMARKS[name]
+    input_samples = synthetic_traffic.traffic(burst, samples, density)
+
+    best_seconds = None
+    for _ in range(repeat):
+        block = make_block()
+        context = FakeContext(block)
+        seconds = 0
+        call_count = 0
+        for call in calls(block, context, input_samples, buffer_size):
+            start = time.perf_counter()
+            call()
+            seconds += time.perf_counter() - start
+            call_count += 1
+        best_seconds = seconds if best_seconds is None else min(best_seconds, seconds)
+
+    # memory is traced in a separate run, as tracing slows down every allocation
+    block = make_block()
+    context = FakeContext(block)
+    allocated_bytes = 0
+    tracemalloc.start()
+    for call in calls(block, context, input_samples, buffer_size):
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+        allocated_bytes += peak - before
+    tracemalloc.stop()
+
+    return {
+        'block': name,
+        'density': density,
+        'samples': samples,
+        'buffer_size': buffer_size,
+        'calls': call_count,
+        'seconds': best_seconds,
+        'samples_per_second': samples / best_seconds,
+        'ns_per_sample': best_seconds / samples * 1e9,
+        'peak_allocated_bytes_per_call': allocated_bytes / call_count,
+        'tags': context.tags,
+        'messages': context.messages,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--blocks', nargs='+', choices=list(BENCHMARKS), default=list(BENCHMARKS),
+                        help='blocks to benchmark (default: all)')
+    parser.add_argument('--densities', type=float, nargs='+', default=synthetic_traffic.DENSITIES,
+                        help='fractions of samples that belong to bursts (default: %(default)s)')
+    parser.add_argument('--samples', type=int, default=1 << 22,
+                        help='samples per benchmark (default: %(default)s)')
+    parser.add_argument('--buffer-size', type=int, default=8192,
+                        help='samples per call of work (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='runs per benchmark, the fastest one is reported (default: %(default)s)')
+    parser.add_argument('-o', '--output', type=argparse.FileType('w'), default=sys.stdout,
+                        help='output file (default: stdout)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = [run_benchmark(name, density, args.samples, args.buffer_size, args.repeat)
+               for name in args.blocks for density in args.densities]
+    json.dump({
+        'python': platform.python_version(),
+        'numpy': numpy.__version__,
+        'results': results,
+    }, args.output, indent=2)
+    args.output.write('\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -24,17 +24,63 @@ description here (python/__init__.py).
 '''
 from __future__ import unicode_literals
 
-# import swig generated symbols into the binary_decoder namespace
-try:
-    # this might fail if the module is python-only
-    from .binary_decoder_swig import *
-except ImportError:
-    pass
-
-# import any pure python here
-from .binary_tagger import binary_tagger
-from .binary_symbol_sync import binary_symbol_sync
-from .binary_dppm_decoder import binary_dppm_decoder
-from .binary_message_debug_sink import binary_message_debug_sink, OutputType
-from .binary_message_processor import binary_message_processor, MessageType
+import importlib
+import sys
+import types
+
+# The blocks and the swig generated symbols are only imported when they are used for the first time, so that
+# importing the package does not load GNU Radio, e.g. for the kernels or the offline decoder.
+_LAZY_ATTRIBUTES = {
+    'binary_tagger': 'binary_tagger',
+    'binary_symbol_sync': 'binary_symbol_sync',
+    'binary_dppm_decoder': 'binary_dppm_decoder',
+    'OverflowPolicy': 'kernels',
+    'binary_dppm_pdu_decoder': 'binary_dppm_pdu_decoder',
+    'binary_message_debug_sink': 'binary_message_debug_sink',
+    'OutputType': 'binary_message_debug_sink',
+    'BufferOverflowPolicy': 'binary_message_debug_sink',
+    'FileFormat': 'binary_message_debug_sink',
+    'binary_message_processor': 'binary_message_processor',
+    'MessageType': 'binary_message_processor',
+    'WorkerType': 'binary_message_processor',
+    'OverrunPolicy': 'binary_message_processor',
+    'binary_run_length_encoder': 'binary_run_length_encoder',
+    'binary_run_tagger': 'binary_run_tagger',
+    'binary_run_dppm_decoder': 'binary_run_dppm_decoder',
+}
+_SUBMODULES = {'async_pipeline', 'kernels', 'offline_decoder', 'pipeline', 'synthetic_traffic'}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module('.' + _LAZY_ATTRIBUTES[name], __name__), name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module('.' + name, __name__)
+    else:
+        try:
+            # this might fail if the module is python-only
+            swig = importlib.import_module('.binary_decoder_swig', __name__)
+            value = getattr(swig, name)
+        except (ImportError, AttributeError):
+            raise AttributeError(f'module {__name__!r} has no attribute {name!r}') from None
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES) | _SUBMODULES)
+
+
+class _LazyModule(types.ModuleType):
+
+    def __setattr__(self, name, value):
+        # importing a block module sets the module as attribute of the package, where the block class is expected
+        if isinstance(value, types.ModuleType) and _LAZY_ATTRIBUTES.get(name) == name:
+            value = getattr(value, name)
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _LazyModule
 #
@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2026 Thomas Reifenberger.
+#
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+#
+"""
+asyncio entry point for the generator pipeline, to decode samples from a pipe, e.g. from rtl_sdr via stdin, in a
+single process without a flowgraph. The samples are read by the event loop, decoded in an executor and the results
+are handed to async consumers, each with its own bounded queue. So neither the decoding nor a slow consumer keeps
+the event loop from reading, and a slow consumer only loses its own oldest results.
+
+    async def print_packet(result):
+        print(*result)
+
+    stages = lambda chunks: dppm_packets(bursts(chunks), samples_per_pulse=10)
+    asyncio.run(run_pipeline(read_chunks_async(sys.stdin.buffer), stages, [print_packet]))
+"""
+import asyncio
+import os
+import stat
+
+import numpy
+
+try:
+    from .kernels import OverflowPolicy
+    from .pipeline import DEFAULT_CHUNK_SIZE
+except ImportError:  # imported as a top level module, e.g. by the QA tests
+    from kernels import OverflowPolicy
+    from pipeline import DEFAULT_CHUNK_SIZE
+
+DEFAULT_MAX_QUEUED_CHUNKS = 16
+DEFAULT_MAX_QUEUED_RESULTS = 1024
+
+_END = object()
+
+
+async def read_chunks_async(file, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield chunks of up to chunk_size int8 samples read from a binary file object, e.g. sys.stdin.buffer, until it is
+    exhausted. Pipes and sockets are read by the event loop without blocking it, other files like regular files or
+    terminals, which cannot be polled reliably, in the default executor.
+    """
+    loop = asyncio.get_running_loop()
+    mode = os.fstat(file.fileno()).st_mode
+    if not stat.S_ISFIFO(mode) and not stat.S_ISSOCK(mode):
+        while True:
+            data = await loop.run_in_executor(None, file.read, chunk_size)
+            if not data:
+                return
+            yield numpy.frombuffer(data, dtype=numpy.int8)
+    # the transport stops reading once twice the limit is buffered, which blocks the writer of the pipe
+    reader = asyncio.StreamReader(limit=chunk_size)
+    transport, _ = await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), file)
+    try:
+        while True:
+            data = await reader.read(chunk_size)
+            if not data:
+                return
+            yield numpy.frombuffer(data, dtype=numpy.int8)
+    finally:
+        transport.close()
+
+
+async def run_pipeline(chunks, stages, consumers, max_queued_chunks=DEFAULT_MAX_QUEUED_CHUNKS,
+                       max_queued_results=DEFAULT_MAX_QUEUED_RESULTS, overflow_policy=OverflowPolicy.DROP_OLDEST,
+                       executor=None):
+    """
+    Decode an async iterable of chunks and await each consumer for each result, until the chunks are exhausted.
+
+    stages turns an iterable of chunks into an iterable of results, e.g. a chain of the generators in
+    binary_decoder.pipeline. It runs in a single thread of the executor (default: the default executor of the
+    loop), which gets up to max_queued_chunks chunks ahead of it. Each consumer is an async function called with one
+    result at a time. Its results are queued up to max_queued_results, beyond which the overflow_policy applies.
+    Returns the number of dropped results per consumer.
+    """
+    loop = asyncio.get_running_loop()
+    chunk_queue = asyncio.Queue(max_queued_chunks)
+    result_queues = [_ResultQueue(max_queued_results, overflow_policy) for _ in consumers]
+
+    def queued_chunks():
+        while True:
+            chunk = asyncio.run_coroutine_threadsafe(chunk_queue.get(), loop).result()
+            if chunk is _END:
+                return
+            yield chunk
+
+    def publish(result):
+        for result_queue in result_queues:
+            result_queue.push(result)
+
+    def decode():
+        for result in stages(queued_chunks()):
+            loop.call_soon_threadsafe(publish, result)
+
+    def finish_consumers(_):
+        for result_queue in result_queues:
+            result_queue.push(_END)
+
+    async def read():
+        async for chunk in chunks:
+            await chunk_queue.put(chunk)
+        await chunk_queue.put(_END)
+
+    reading = asyncio.ensure_future(read())
+    decoding = asyncio.ensure_future(loop.run_in_executor(executor, decode))
+    # the results are published before the decoding is done, so the consumers see all of them
+    decoding.add_done_callback(finish_consumers)
+    consuming = [asyncio.ensure_future(_consume(result_queue, consumer))
+                 for result_queue, consumer in zip(result_queues, consumers)]
+    try:
+        done, _ = await asyncio.wait([reading, decoding, *consuming], return_when=asyncio.FIRST_EXCEPTION)
+        for task in done:
+            task.result()
+    finally:
+        reading.cancel()
+        for task in consuming:
+            task.cancel()
+        if not decoding.done():
+            # let the decoding thread finish instead of waiting for chunks forever
+            while not chunk_queue.empty():
+                chunk_queue.get_nowait()
+            chunk_queue.put_nowait(_END)
+    return [result_queue.dropped_results for result_queue in result_queues]
+
+
+async def _consume(result_queue, consumer):
+    while True:
+        result = await result_queue.get()
+        if result is _END:
+            return
+        await consumer(result)
+
+
+class _ResultQueue(asyncio.Queue):
+    """asyncio.Queue that drops results on overflow instead of blocking, like PacketRingBuffer."""
+
+    def __init__(self, maxsize, overflow_policy):
+        super().__init__()
+        self._max_queued_results = maxsize
+        self._overflow_policy = overflow_policy
+        self.dropped_results = 0
+
+    def push(self, result):
+        if result is not _END and self.qsize() >= self._max_queued_results:
+            self.dropped_results += 1
+            if self._overflow_policy == OverflowPolicy.DROP_NEWEST:
+                return
+            self.get_nowait()
+        self.put_nowait(result)
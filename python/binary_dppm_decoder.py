@@ -18,7 +18,6 @@
 # the Free Software Foundation, Inc., 51 Franklin Street,
 # Boston, MA 02110-1301, USA.
 #
-import itertools
 from dataclasses import dataclass
 
 import numpy
@@ -27,7 +26,12 @@ import typing
 import pmt
 from gnuradio import gr
 
-PACKET_LENGTH_TAG_KEY = 'packet_len'
+try:
+    from .kernels import PACKET_LENGTH_TAG_KEY, PACKET_OFFSET_KEY, DppmDecoder, OverflowPolicy
+except ImportError:  # imported as a top level module, e.g. by the QA tests
+    from kernels import PACKET_LENGTH_TAG_KEY, PACKET_OFFSET_KEY, DppmDecoder, OverflowPolicy
+
+PDU_PORT = 'pdu'
 
 
 class binary_dppm_decoder(gr.basic_block):
@@ -35,133 +39,98 @@ class binary_dppm_decoder(gr.basic_block):
     docstring for block binary_dppm_decoder
     """
 
-    def __init__(self, samples_per_pulse=10, samples_per_gap=(10, 20), max_deviation=1, max_packet_length=64):
+    def __init__(self, samples_per_pulse=10, samples_per_gap=(10, 20), max_deviation=1, max_packet_length=64,
+                 max_queued_symbols=65536, stream_output=True, pdu_output=False):
+        if not stream_output and not pdu_output:
+            raise ValueError('stream_output or pdu_output must be enabled')
         gr.basic_block.__init__(self,
                                 name="binary_dppm_decoder",
                                 in_sig=[numpy.int8, ],
-                                out_sig=[numpy.int8, ])
-        self._samples_per_pulse = samples_per_pulse
-        self._samples_per_gap = numpy.array(list(samples_per_gap))
-        self._max_deviation = max_deviation
+                                out_sig=[numpy.int8, ] if stream_output else None)
+        # input that would not fit into the queue is held back, so no packets are dropped
+        self._decoder = DppmDecoder(samples_per_pulse, samples_per_gap, max_deviation, max_packet_length,
+                                    max_queued_symbols, OverflowPolicy.DROP_OLDEST)
         self._max_packet_length = max_packet_length
-        self._validate_parameters()
-
-        self.set_output_multiple(self._max_packet_length)
-
-        # internal state
-        self._last_positive_edge = None
-        self._last_negative_edge = None
-        self._pending_symbol = None
-        self._pending_packet = []
-        self._output_queue = []
-
-    def _validate_parameters(self):
-        if self._samples_per_pulse < 1 or not isinstance(self._samples_per_pulse, int):
-            raise ValueError('samples_per_pulse must be a positive integer')
-        if len(set(self._samples_per_gap)) < len(self._samples_per_gap) or \
-                not issubclass(self._samples_per_gap.dtype.type, numpy.integer) or \
-                numpy.any(self._samples_per_gap < 1):
-            raise ValueError('samples_per_gap must be a list of distinct positive integers')
-        if len(self._samples_per_gap) < 2:
-            raise ValueError('samples_per_gap must have at least two elements')
-        if self._max_deviation < 0 or type(self._max_deviation) != int:
-            raise ValueError('max_deviation must be a non-negative integer')
-        if self._max_packet_length < 1 or not isinstance(self._max_packet_length, int):
-            raise ValueError('max_packet_length must be a positive integer')
-        min_gap_distance = min([abs(y - x) for x, y in itertools.combinations(self._samples_per_gap, 2)])
-        if min_gap_distance <= 2 * self._max_deviation:
-            raise ValueError('difference between any 2 values in samples_per_gap must not be smaller '
-                             'than 2 * max_deviation')
+        self._max_queued_symbols = max_queued_symbols
+        self._min_samples_per_symbol = samples_per_pulse + min(samples_per_gap)
+        self._stream_output = stream_output
+        self._pdu_output = pdu_output
+
+        if self._stream_output:
+            self.set_output_multiple(self._max_packet_length)
+        if self._pdu_output:
+            self.message_port_register_out(pmt.intern(PDU_PORT))
 
     def forecast(self, noutput_items, ninput_items_required):
         # setup size of input_items[i] for work call
         for i in range(len(ninput_items_required)):
-            ninput_items_required[i] = (noutput_items - self._max_packet_length + 1) * \
-                                       (self._samples_per_pulse + int(numpy.min(self._samples_per_gap)))
+            if self._stream_output:
+                ninput_items_required[i] = (noutput_items - self._max_packet_length + 1) * self._min_samples_per_symbol
+            else:
+                ninput_items_required[i] = 1
 
     def general_work(self, input_items, output_items):
         in0 = input_items[0]
+
+        if not self._stream_output:
+            # all packets are published right away, so the input can be decoded at once
+            publish_packets(self, self._decoder.decode_dppm(in0))
+            self.consume(0, len(in0))
+            return 0
+
         out0 = output_items[0]
 
         normalized_input = numpy.abs(numpy.sign(in0))
         differential_input = numpy.diff(normalized_input)
 
-        edges = list(numpy.argwhere(differential_input != 0))
+        edges = numpy.flatnonzero(differential_input)
 
         nitems_read = self.nitems_read(0)
 
-        while len(edges) > 0 and \
-                sum([len(packet) for packet in self._output_queue]) + self._max_packet_length <= len(out0):
-            edge = edges.pop(0)
-            edge_type = numpy.asscalar(differential_input[edge])
-            if edge_type == 1:
-                self._last_positive_edge = edge + nitems_read
-                if self._last_negative_edge is not None:
-                    gap = self._last_positive_edge - self._last_negative_edge
-                    symbol = self._decode_gap_to_symbol(gap)
-                    if symbol is not None:
-                        self._pending_symbol = symbol
-                    else:
-                        self._pending_symbol = None
-                        self._rotate_packet()
-            elif edge_type == -1:
-                self._last_negative_edge = None
-                if self._last_positive_edge is not None:
-                    pulse = edge + nitems_read - self._last_positive_edge
-                    if numpy.abs(pulse - self._samples_per_pulse) <= self._max_deviation:
-                        self._last_negative_edge = edge + nitems_read
-                        self._push_symbol_to_current_packet()
-                    else:
-                        self._pending_symbol = None
-                        self._rotate_packet()
-            else:
-                raise RuntimeError(f'Invalid edge type {edge_type}')
-
-        if self._last_negative_edge is not None and self._last_negative_edge > (self._last_positive_edge or -1):
-            gap = self.nitems_read(0) + len(differential_input) - self._last_negative_edge
-            if gap > max(self._samples_per_gap) + self._max_deviation:
-                self._rotate_packet()
-        elif self._last_positive_edge is not None and self._last_positive_edge > (self._last_negative_edge or -1):
-            pulse = self.nitems_read(0) + len(differential_input) - self._last_positive_edge
-            if pulse > self._samples_per_pulse + self._max_deviation:
-                self._rotate_packet()
-
-        if len(edges) == 0:
+        # input that would not fit into the queue or the output is held back
+        processed_edges = self._decoder.decode_edges(edges + nitems_read, differential_input[edges] == 1,
+                                                     min(len(out0), self._max_queued_symbols))
+        self._decoder.finish_timed_out_packet(nitems_read + len(differential_input))
+
+        if processed_edges == len(edges):
             consumed = len(in0) - 1
         else:
-            consumed = edges[0]
-        sent_symbols = self._flush_packets(out0)
+            consumed = int(edges[processed_edges])
+        sent_symbols = flush_packets(self, self._decoder, out0, self._pdu_output)
 
         self.consume(0, consumed)
         return sent_symbols
 
-    def _decode_gap_to_symbol(self, gap):
-        for symbol, expected_samples in enumerate(self._samples_per_gap):
-            if numpy.abs(gap - expected_samples) <= self._max_deviation:
-                return symbol
-        return None
-
-    def _push_symbol_to_current_packet(self):
-        if self._pending_symbol is not None:
-            self._pending_packet.append(self._pending_symbol)
-            self._pending_symbol = None
-            if len(self._pending_packet) >= self._max_packet_length:
-                self._rotate_packet()
-
-    def _rotate_packet(self):
-        if len(self._pending_packet):
-            self._output_queue.append(self._pending_packet)
-            self._pending_packet = []
-
-    def _flush_packets(self, out0):
-        sent_symbols = 0
-        while len(self._output_queue) > 0 and sent_symbols + len(self._output_queue[0]) <= len(out0):
-            packet = self._output_queue.pop(0)
-            self.add_item_tag(0, self.nitems_written(0) + sent_symbols,
-                              pmt.string_to_symbol(PACKET_LENGTH_TAG_KEY), pmt.to_pmt(len(packet)))
-            out0[sent_symbols:sent_symbols + len(packet)] = packet
-            sent_symbols += len(packet)
-        return sent_symbols
+
+def flush_packets(block, decoder, out0, pdu_output=False):
+    """
+    Move the queued packets of the decoder that fit into out0 and tag each of them with its length. With pdu_output,
+    each packet is published as a PDU as well.
+    """
+    sent_symbols = 0
+    while len(decoder.output_queue) > 0 and sent_symbols + decoder.output_queue.peek_length() <= len(out0):
+        offset = decoder.output_queue.peek_offset()
+        length = decoder.output_queue.pop(out0[sent_symbols:])
+        block.add_item_tag(0, block.nitems_written(0) + sent_symbols,
+                           pmt.string_to_symbol(PACKET_LENGTH_TAG_KEY), pmt.to_pmt(length))
+        if pdu_output:
+            block.message_port_pub(pmt.intern(PDU_PORT), make_pdu(offset, out0[sent_symbols:sent_symbols + length]))
+        sent_symbols += length
+    return sent_symbols
+
+
+def publish_packets(block, packets):
+    """Publish a list of (offset, packet) as PDUs."""
+    for offset, packet in packets:
+        block.message_port_pub(pmt.intern(PDU_PORT), make_pdu(offset, packet))
+
+
+def make_pdu(offset, packet):
+    """PDU with the symbols of the packet as u8vector and its sample offset and length as metadata."""
+    metadata = pmt.make_dict()
+    metadata = pmt.dict_add(metadata, pmt.intern(PACKET_OFFSET_KEY), pmt.from_uint64(offset))
+    metadata = pmt.dict_add(metadata, pmt.intern(PACKET_LENGTH_TAG_KEY), pmt.from_long(len(packet)))
+    return pmt.cons(metadata, pmt.to_pmt(packet.astype(numpy.uint8)))
 
 
 @dataclass
@@ -0,0 +1,36 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2026 Thomas Reifenberger.
+#
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+#
+try:
+    from .binary_dppm_decoder import binary_dppm_decoder
+except ImportError:  # imported as a top level module, e.g. by the QA tests
+    from binary_dppm_decoder import binary_dppm_decoder
+
+
+class binary_dppm_pdu_decoder(binary_dppm_decoder):
+    """
+    binary_dppm_decoder with only the PDU output, for a block that replaces binary_dppm_decoder -> Tagged Stream to
+    PDU in GRC. Each packet is published as a PDU on the message port 'pdu', with the sample offset and length of the
+    packet as metadata.
+    """
+
+    def __init__(self, samples_per_pulse=10, samples_per_gap=(10, 20), max_deviation=1, max_packet_length=64):
+        binary_dppm_decoder.__init__(self, samples_per_pulse, samples_per_gap, max_deviation, max_packet_length,
+                                     stream_output=False, pdu_output=True)
@@ -19,12 +19,35 @@
 # Boston, MA 02110-1301, USA.
 #
 
+import collections
 import enum
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import signal
+import struct
+import sys
+import threading
+import time
 
-import numpy
 import pmt
 from gnuradio import gr
 
+try:
+    from .kernels import PACKET_OFFSET_KEY
+except ImportError:  # imported as a top level module, e.g. by the QA tests
+    from kernels import PACKET_OFFSET_KEY
+
+# header of a binary record: offset (-1 if unknown), timestamp, whether the payload is binary, metadata length
+BINARY_RECORD_HEADER = struct.Struct('<qd?I')
+BINARY_RECORD_LENGTH = struct.Struct('<I')
+# bytes counted for each flight recorder entry in addition to its payload, roughly its tuple and PMT objects
+RECORDER_ENTRY_OVERHEAD = 64
+# payloads remembered for deduplication, the oldest ones are forgotten first beyond that
+DEDUP_MAX_PAYLOADS = 100000
+
 
 class OutputType(enum.Enum):
     RAW = 'raw'
@@ -32,75 +55,611 @@ class OutputType(enum.Enum):
     HEX = 'hex'
 
 
+class BufferOverflowPolicy(enum.Enum):
+    BLOCK = 'block'
+    DROP = 'drop'
+    COUNT = 'count'
+
+
+class FileFormat(enum.Enum):
+    JSON_LINES = 'json_lines'
+    BINARY = 'binary'
+
+
 class binary_message_debug_sink(gr.basic_block):
     """
     docstring for block binary_message_debug_sink
     """
 
-    def __init__(self, output=OutputType.RAW, binary_output=OutputType.HEX, bytes_per_sep=1):
+    def __init__(self, output=OutputType.RAW, binary_output=OutputType.HEX, bytes_per_sep=1, buffered=False,
+                 buffer_size=1 << 20, overflow_policy=BufferOverflowPolicy.COUNT, file_path='',
+                 file_format=FileFormat.JSON_LINES, rotate_bytes=0, rotate_seconds=0, compress=False, max_rate=0,
+                 every_nth=1, dedup_seconds=0, summary_seconds=10, stats_only=False, stats_interval_seconds=10,
+                 stats_top_n=10, stats_prefix_length=4, recorder_messages=0, recorder_bytes=0, dump_predicate='',
+                 dump_on_sigusr1=False):
         gr.basic_block.__init__(self,
                                 name="binary_message_debug_sink",
                                 in_sig=None,
                                 out_sig=None)
         self.message_port_register_in(pmt.intern('in'))
         self.message_port_register_in(pmt.intern('pdu_in'))
+        self.message_port_register_in(pmt.intern('dump'))
 
         if output in [OutputType.RAW, OutputType.PYTHON]:
-            self._printer = self._get_printer(output, bytes_per_sep)
+            self._formatter = self._get_formatter(output, bytes_per_sep)
         else:
             raise ValueError(f'Unknown output type {output}')
         if binary_output in [OutputType.RAW, OutputType.PYTHON, OutputType.HEX]:
-            self._binary_printer = self._get_printer(binary_output, bytes_per_sep)
+            self._binary_formatter = self._get_formatter(binary_output, bytes_per_sep)
         else:
             raise ValueError(f'Unknown binary_output type {binary_output}')
+        if overflow_policy not in [BufferOverflowPolicy.BLOCK, BufferOverflowPolicy.DROP, BufferOverflowPolicy.COUNT]:
+            raise ValueError(f'Unknown overflow_policy {overflow_policy}')
+        if file_format == FileFormat.JSON_LINES:
+            self._encode_record = encode_json_record
+        elif file_format == FileFormat.BINARY:
+            self._encode_record = encode_binary_record
+        else:
+            raise ValueError(f'Unknown file_format {file_format}')
+        self._buffered = buffered
+        self._buffer_size = buffer_size
+        self._overflow_policy = overflow_policy
+        self._writer = None
+        self._file_path = file_path
+        self._rotate_bytes = rotate_bytes
+        self._rotate_seconds = rotate_seconds
+        self._compress = compress
+        self._file = None
+        if every_nth < 1:
+            raise ValueError('every_nth must be at least 1')
+        self._sampler = OutputSampler(max_rate, every_nth, dedup_seconds)
+        self._is_sampled = max_rate > 0 or every_nth > 1 or dedup_seconds > 0
+        self._dedup = dedup_seconds > 0
+        self._summary_seconds = summary_seconds
+        self._last_summary = time.monotonic()
+        if stats_only and file_path:
+            raise ValueError('stats_only cannot be combined with file output')
+        self._stats = TrafficStats(stats_top_n, stats_prefix_length) if stats_only else None
+        self._stats_interval_seconds = stats_interval_seconds
+        self._last_stats_report = time.monotonic()
+        if (recorder_messages > 0 or recorder_bytes > 0) and stats_only:
+            raise ValueError('the flight recorder cannot be combined with stats_only')
+        self._recorder = FlightRecorder(recorder_messages, recorder_bytes) \
+            if recorder_messages > 0 or recorder_bytes > 0 else None
+        if (dump_predicate or dump_on_sigusr1) and self._recorder is None:
+            raise ValueError('dump_predicate and dump_on_sigusr1 require recorder_messages or recorder_bytes')
+        self._dump_predicate = eval(f'lambda tags, data: {dump_predicate}', {'pmt': pmt}) if dump_predicate else None
+        self._is_running = False
+        if dump_on_sigusr1:
+            if threading.current_thread() is not threading.main_thread():
+                raise ValueError('dump_on_sigusr1 requires the block to be created in the main thread')
+            # start() and stop() are called by the scheduler threads, which cannot change signal handlers, so the
+            # handler stays installed until the process exits or another block replaces it
+            signal.signal(signal.SIGUSR1, self._handle_sigusr1)
+        self._timers = []
 
         self.set_msg_handler(pmt.intern('in'), self._handle_message)
         self.set_msg_handler(pmt.intern('pdu_in'), self._handle_pdu_message)
+        self.set_msg_handler(pmt.intern('dump'), self._handle_dump_message)
+
+    def start(self):
+        if self._file_path:
+            # records are always written in batches, a line about dropped records would break the format
+            self._file = RotatingFile(self._file_path, self._rotate_bytes, self._rotate_seconds, self._compress)
+            self._writer = BufferedWriter(self._file, self._buffer_size, self._overflow_policy, report_drops=False)
+        elif self._buffered:
+            self._writer = BufferedWriter(sys.stdout, self._buffer_size, self._overflow_policy)
+        self._is_running = True
+        # the reports are printed on time even if no message arrives
+        self._last_summary = self._last_stats_report = time.monotonic()
+        if self._is_sampled and self._summary_seconds > 0:
+            self._timers.append(RepeatingTimer(self._summary_seconds, self._print_summary))
+        if self._stats is not None and self._stats_interval_seconds > 0:
+            self._timers.append(RepeatingTimer(self._stats_interval_seconds, self._print_stats))
+        for timer in self._timers:
+            timer.start()
+        return True
+
+    def stop(self):
+        self._is_running = False
+        for timer in self._timers:
+            timer.cancel()
+        self._timers = []
+        self._print_summary()
+        if self._stats is not None:
+            self._print_stats()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        return True
+
+    def dropped_messages(self):
+        return self._writer.dropped_lines if self._writer is not None else 0
+
+    def suppressed_messages(self):
+        return self._sampler.total_suppressed
+
+    def dump_recorder(self, reason='requested'):
+        """Output the messages in the flight recorder and empty it."""
+        entries = self._recorder.take() if self._recorder is not None else []
+        if self._file is None:
+            self._print(f'Flight recorder dump ({reason}): {len(entries)} messages')
+        for timestamp, metadata, data in entries:
+            self._output(timestamp, metadata, data)
 
-    def _get_printer(self, type_, bytes_per_sep):
+    def _get_formatter(self, type_, bytes_per_sep):
         if type_ == OutputType.RAW:
-            return self._print_message_raw
+            return self._format_message_raw
         elif type_ == OutputType.PYTHON:
-            return self._print_message_python
+            return self._format_message_python
         elif type_ == OutputType.HEX:
-            return self._print_message_hex(bytes_per_sep)
+            return self._format_message_hex(bytes_per_sep)
         else:
             raise ValueError(f'Unknown output type {type_}')
 
     def _handle_message(self, message):
-        if self._is_binary(message):
-            self._binary_printer(message)
-        else:
-            self._printer(message)
+        if self._stats is not None:
+            self._count(message, is_pdu=False)
+            return
+        if self._recorder is not None:
+            self._record(pmt.PMT_NIL, message)
+        elif not self._is_sampled or self._sample(message):
+            self._output(time.time(), pmt.PMT_NIL, message)
 
     def _handle_pdu_message(self, message):
         if not pmt.is_pair(message):
-            print('Invalid pdu: ', message)
+            self._print(f'Invalid pdu:  {message}')
+        elif self._stats is not None:
+            self._count(pmt.cdr(message), is_pdu=True)
+        elif self._recorder is not None:
+            self._record(pmt.car(message), pmt.cdr(message))
+        elif not self._is_sampled or self._sample(pmt.cdr(message)):
+            self._output(time.time(), pmt.car(message), pmt.cdr(message))
+
+    def _handle_dump_message(self, message):
+        self.dump_recorder('dump message')
+
+    def _handle_sigusr1(self, signum, frame):
+        if not self._is_running:
+            return
+        # the signal interrupts the main thread at any point, so the dump is left to another thread
+        threading.Thread(target=self.dump_recorder, args=('SIGUSR1',), daemon=True).start()
+
+    def _output(self, timestamp, metadata, data):
+        if self._file is not None:
+            self._writer.write(self._encode_record(timestamp, metadata, data))
+        elif self._is_binary(data):
+            self._print(self._binary_formatter(data))
+        else:
+            self._print(self._formatter(data))
+
+    def _record(self, metadata, data):
+        # the messages are kept as they are, formatting is left to the dump
+        self._recorder.add((time.time(), metadata, data), self._recorded_size(metadata, data))
+        if self._dump_predicate is not None and self._dump_predicate(metadata, data):
+            self.dump_recorder('predicate')
+
+    def _recorded_size(self, metadata, data):
+        # binary payloads are counted without a copy, anything else by its serialized size
+        size = pmt.length(data) if self._is_binary(data) else len(pmt.serialize_str(data))
+        if not pmt.is_null(metadata):
+            size += len(pmt.serialize_str(metadata))
+        return size
+
+    def _sample(self, data):
+        payload = None
+        if self._dedup:
+            payload = bytes(pmt.u8vector_elements(data)) if self._is_binary(data) else str(data)
+        return self._sampler.accept(payload)
+
+    def _count(self, data, is_pdu):
+        if self._is_binary(data):
+            # only the prefix is copied, so long payloads cost the same as short ones
+            length = pmt.length(data)
+            prefix = bytes(pmt.u8vector_ref(data, i) for i in range(min(self._stats.prefix_length, length)))
+            self._stats.add(is_pdu, length, prefix)
+        else:
+            self._stats.add(is_pdu)
+
+    def _print_stats(self):
+        now = time.monotonic()
+        self._print(self._stats.report(now - self._last_stats_report))
+        self._last_stats_report = now
+
+    def _print_summary(self):
+        now = time.monotonic()
+        suppressed = self._sampler.take_suppressed()
+        # a summary line would break the format of a file
+        if suppressed > 0 and self._file is None:
+            self._print(f'{suppressed} messages suppressed in the last {now - self._last_summary:.0f} s')
+        self._last_summary = now
+
+    def _print(self, line):
+        if self._writer is not None:
+            self._writer.write(line + '\n')
         else:
-            data = pmt.cdr(message)
-            if self._is_binary(data):
-                self._binary_printer(data)
-            else:
-                self._printer(data)
+            print(line)
 
     @staticmethod
     def _is_binary(message):
         return pmt.is_u8vector(message)
 
     @staticmethod
-    def _print_message_raw(message):
-        print(message)
+    def _format_message_raw(message):
+        return str(message)
 
     @staticmethod
-    def _print_message_python(message):
-        print(pmt.to_python(message))
+    def _format_message_python(message):
+        return str(pmt.to_python(message))
 
     @staticmethod
-    def _print_message_hex(bytes_per_sep):
-        def handler(message):
-            decoded_message = pmt.to_python(message)
-            if type(decoded_message) != numpy.ndarray or decoded_message.dtype != numpy.uint8:
+    def _format_message_hex(bytes_per_sep):
+        def formatter(message):
+            if not pmt.is_u8vector(message):
                 raise ValueError('Binary printer can only print arrays of uint8')
-            print(bytes.hex(decoded_message.tobytes(), ' ', bytes_per_sep=bytes_per_sep))
+            # straight from the elements of the u8vector, without converting it to an array first
+            return bytes(pmt.u8vector_elements(message)).hex(' ', bytes_per_sep)
+
+        return formatter
+
+
+class OutputSampler:
+    """
+    Decides which messages are output: only every every_nth one, only the first one with the same payload within
+    dedup_seconds, and at most max_rate per second (0 to disable). Counts the suppressed ones.
+    """
+
+    def __init__(self, max_rate=0, every_nth=1, dedup_seconds=0, clock=time.monotonic,
+                 max_payloads=DEDUP_MAX_PAYLOADS):
+        self._max_rate = max_rate
+        self._every_nth = every_nth
+        self._dedup_seconds = dedup_seconds
+        self._clock = clock
+        self._count = 0
+        # token bucket, which allows bursts of up to max_rate messages
+        self._tokens = max_rate
+        self._last_refill = clock()
+        # time each payload was output by its digest, in the order they were output
+        self._payload_times = {}
+        self._max_payloads = max_payloads
+        self._suppressed = 0
+        self.total_suppressed = 0
+        # the suppressed messages are taken by the thread printing the summary
+        self._lock = threading.Lock()
+
+    def accept(self, payload=None):
+        """Whether to output a message, payload is only needed for deduplication."""
+        now = self._clock()
+        self._count += 1
+        if (self._count - 1) % self._every_nth != 0:
+            return self._suppress()
+        if self._dedup_seconds > 0:
+            self._forget_payloads(now)
+            # a digest instead of the payload keeps the memory per payload small
+            payload = hashlib.blake2b(payload if isinstance(payload, bytes) else str(payload).encode(),
+                                      digest_size=16).digest()
+            if payload in self._payload_times:
+                return self._suppress()
+        if self._max_rate > 0:
+            self._tokens = min(self._max_rate, self._tokens + (now - self._last_refill) * self._max_rate)
+            self._last_refill = now
+            if self._tokens < 1:
+                return self._suppress()
+            self._tokens -= 1
+        if self._dedup_seconds > 0:
+            self._payload_times[payload] = now
+            if len(self._payload_times) > self._max_payloads:
+                del self._payload_times[next(iter(self._payload_times))]
+        return True
+
+    def take_suppressed(self):
+        """Number of messages suppressed since the last call."""
+        with self._lock:
+            suppressed, self._suppressed = self._suppressed, 0
+        return suppressed
+
+    def _suppress(self):
+        with self._lock:
+            self._suppressed += 1
+            self.total_suppressed += 1
+        return False
+
+    def _forget_payloads(self, now):
+        # a payload is only added again after it was forgotten, so the oldest one is always the first
+        while self._payload_times:
+            payload, output_time = next(iter(self._payload_times.items()))
+            if now - output_time < self._dedup_seconds:
+                return
+            del self._payload_times[payload]
+
+
+class TrafficStats:
+    """
+    Counts messages, PDUs, the lengths of binary payloads in power of two buckets and the most frequent payload
+    prefixes, in constant memory and amortized constant time per message. The counts are reset with each report.
+    """
+
+    def __init__(self, top_n=10, prefix_length=4):
+        self.top_n = top_n
+        self.prefix_length = prefix_length
+        # the counts are reported by another thread than the one adding messages
+        self._lock = threading.Lock()
+        self._reset()
+
+    def add(self, is_pdu, length=None, prefix=None):
+        """Count a message, length and prefix are only given for binary payloads."""
+        with self._lock:
+            self._messages += 1
+            self._pdus += is_pdu
+            if length is None:
+                self._non_binary += 1
+                return
+            bucket = 1 << max(length - 1, 0).bit_length()
+            self._lengths[bucket] = self._lengths.get(bucket, 0) + 1
+            self._add_prefix(prefix)
+
+    def report(self, elapsed):
+        """One line with the counts since the last report, which was elapsed seconds ago."""
+        with self._lock:
+            messages, pdus, non_binary = self._messages, self._pdus, self._non_binary
+            lengths, prefix_counts = self._lengths, self._prefix_counts
+            self._reset()
+        lengths = ', '.join(f'<={bucket}: {count}' for bucket, count in sorted(lengths.items()))
+        top_prefixes = sorted(prefix_counts.items(), key=lambda item: item[1], reverse=True)[:self.top_n]
+        prefixes = ', '.join(f'{prefix.hex()}: {count}' for prefix, count in top_prefixes)
+        return (f'{messages} messages ({messages / max(elapsed, 1e-9):.1f}/s), {pdus} PDUs, {messages - pdus} raw, '
+                f'{non_binary} not binary; lengths: {lengths or "-"}; top prefixes: {prefixes or "-"}')
+
+    def _add_prefix(self, prefix):
+        # Misra-Gries heavy hitters: the counts are too low by at most the number of prefixes over capacity
+        counts = self._prefix_counts
+        if prefix in counts:
+            counts[prefix] += 1
+        elif len(counts) < self._prefix_capacity:
+            counts[prefix] = 1
+        else:
+            # each decrement matches an earlier increment, so this is amortized constant time
+            for known_prefix in list(counts):
+                counts[known_prefix] -= 1
+                if counts[known_prefix] == 0:
+                    del counts[known_prefix]
+
+    def _reset(self):
+        self._messages = 0
+        self._pdus = 0
+        self._non_binary = 0
+        self._lengths = {}
+        self._prefix_counts = {}
+        # more counters than reported make the top entries more accurate
+        self._prefix_capacity = 4 * self.top_n
+
+
+class RepeatingTimer(threading.Thread):
+    """Calls function every interval seconds in a daemon thread, until it is cancelled."""
+
+    def __init__(self, interval, function):
+        super().__init__(name='binary_message_debug_sink', daemon=True)
+        self._interval = interval
+        self._function = function
+        self._cancelled = threading.Event()
+
+    def run(self):
+        while not self._cancelled.wait(self._interval):
+            self._function()
+
+    def cancel(self):
+        """Stop calling function and wait for a running call to finish."""
+        self._cancelled.set()
+        self.join()
+
+
+class FlightRecorder:
+    """
+    Keeps the last max_messages entries, or as many of the last entries as fit into max_bytes, if given. Each entry
+    counts with its size plus RECORDER_ENTRY_OVERHEAD bytes, so the number of entries is bounded by max_bytes as well.
+    The newest entry is always kept, even if it is larger than max_bytes.
+    """
+
+    def __init__(self, max_messages=0, max_bytes=0):
+        self.max_bytes = max_bytes
+        self._entries = collections.deque(maxlen=max_messages if max_messages > 0 else None)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def add(self, entry, size=0):
+        """Record an entry of size bytes, dropping the oldest entries beyond the limits."""
+        with self._lock:
+            if len(self._entries) == self._entries.maxlen:
+                self._bytes -= self._entries[0][0]
+            size += RECORDER_ENTRY_OVERHEAD
+            self._entries.append((size, entry))
+            self._bytes += size
+            while 0 < self.max_bytes < self._bytes and len(self._entries) > 1:
+                self._bytes -= self._entries.popleft()[0]
+
+    def take(self):
+        """Return the recorded entries, oldest first, and forget them."""
+        with self._lock:
+            entries = [entry for _, entry in self._entries]
+            self._entries.clear()
+            self._bytes = 0
+        return entries
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class BufferedWriter:
+    """
+    Collects text in a buffer of up to buffer_size characters, which a background thread writes to the file in as
+    few writes as possible. If the buffer is full, write blocks, drops the text or drops it and writes the number of
+    dropped lines once there is space again, depending on the overflow policy.
+    """
+
+    def __init__(self, file, buffer_size, overflow_policy=BufferOverflowPolicy.COUNT, report_drops=True):
+        self._file = file
+        self._buffer_size = buffer_size
+        self._overflow_policy = overflow_policy
+        self._report_drops = report_drops
+        self._buffer = []
+        self._buffered_size = 0
+        self._unreported_dropped_lines = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self.dropped_lines = 0
+        self._thread = threading.Thread(target=self._write_buffer, name='binary_message_debug_sink', daemon=True)
+        self._thread.start()
+
+    def write(self, text):
+        """Buffer text, which is a str or, for binary files, bytes."""
+        with self._condition:
+            if self._overflow_policy == BufferOverflowPolicy.BLOCK:
+                # text longer than the buffer is accepted once the buffer is empty
+                self._condition.wait_for(lambda: self._buffered_size == 0
+                                         or self._buffered_size + len(text) <= self._buffer_size)
+            elif self._buffered_size + len(text) > self._buffer_size:
+                self.dropped_lines += 1
+                if self._overflow_policy == BufferOverflowPolicy.COUNT and self._report_drops:
+                    self._unreported_dropped_lines += 1
+                return
+            self._buffer.append(text)
+            self._buffered_size += len(text)
+            self._condition.notify_all()
+
+    def close(self):
+        """Write the remaining text and stop the background thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+
+    def _write_buffer(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._buffer or self._closed)
+                if not self._buffer and self._closed:
+                    return
+                buffer, self._buffer = self._buffer, []
+                self._buffered_size = 0
+                dropped_lines, self._unreported_dropped_lines = self._unreported_dropped_lines, 0
+                self._condition.notify_all()
+            if dropped_lines > 0:
+                buffer.append(f'{dropped_lines} messages dropped\n')
+            # an empty str or bytes to join the buffer
+            self._file.write(buffer[0][:0].join(buffer))
+            self._file.flush()
+
+
+class RotatingFile:
+    """
+    Binary file that is rotated on a write once it has rotate_bytes or is rotate_seconds old (0 to disable). The
+    rotated file gets the time of the rotation as suffix and is gzip compressed in the background if compress is set.
+    """
+
+    def __init__(self, path, rotate_bytes=0, rotate_seconds=0, compress=False):
+        self._path = path
+        self._rotate_bytes = rotate_bytes
+        self._rotate_seconds = rotate_seconds
+        self._compress = compress
+        self._compressing = []
+        self._open()
+
+    def write(self, data):
+        if self._rotate_bytes > 0 and self._file.tell() >= self._rotate_bytes \
+                or self._rotate_seconds > 0 and time.time() - self._opened >= self._rotate_seconds:
+            self.rotate()
+        self._file.write(data)
+
+    def flush(self):
+        self._file.flush()
+
+    def rotate(self):
+        self._file.close()
+        rotated_path = f'{self._path}.{time.strftime("%Y%m%d-%H%M%S")}'
+        suffix = 0
+        while os.path.exists(rotated_path) or os.path.exists(rotated_path + '.gz'):
+            suffix += 1
+            rotated_path = f'{self._path}.{time.strftime("%Y%m%d-%H%M%S")}.{suffix}'
+        os.rename(self._path, rotated_path)
+        if self._compress:
+            thread = threading.Thread(target=compress_file, args=(rotated_path,))
+            thread.start()
+            self._compressing = [thread for thread in self._compressing if thread.is_alive()] + [thread]
+        self._open()
+
+    def close(self):
+        self._file.close()
+        for thread in self._compressing:
+            thread.join()
+
+    def _open(self):
+        self._file = open(self._path, 'ab')
+        self._opened = time.time()
+
+
+def compress_file(path):
+    """Replace a file by its gzip compressed version."""
+    with open(path, 'rb') as source, gzip.open(path + '.gz', 'wb') as destination:
+        shutil.copyfileobj(source, destination)
+    os.remove(path)
+
+
+def _record_fields(metadata, data):
+    tags = pmt.to_python(metadata) if not pmt.is_null(metadata) else {}
+    if not isinstance(tags, dict):
+        tags = {'metadata': tags}
+    offset = tags.get(PACKET_OFFSET_KEY)
+    if pmt.is_u8vector(data):
+        return offset, tags, True, bytes(pmt.u8vector_elements(data))
+    return offset, tags, False, pmt.to_python(data)
+
+
+def _to_json(value):
+    # for the values of pmt.to_python, which json cannot encode itself
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    if isinstance(value, bytes):
+        return value.hex()
+    return str(value)
+
+
+def encode_json_record(timestamp, metadata, data):
+    """
+    A JSON line with the offset of the packet (or null), the timestamp, the metadata of the PDU and the data, as hex
+    string if it is a u8vector.
+    """
+    offset, tags, is_binary, payload = _record_fields(metadata, data)
+    record = {'offset': offset, 'timestamp': timestamp, 'metadata': tags,
+              'data': payload.hex() if is_binary else payload}
+    return (json.dumps(record, default=_to_json) + '\n').encode()
+
+
+def encode_binary_record(timestamp, metadata, data):
+    """
+    A record of its length (uint32) and BINARY_RECORD_HEADER, followed by the metadata as JSON and the payload: the
+    u8vector as it is or any other data as JSON. All numbers are little endian.
+    """
+    offset, tags, is_binary, payload = _record_fields(metadata, data)
+    encoded_tags = json.dumps(tags, default=_to_json).encode()
+    if not is_binary:
+        payload = json.dumps(payload, default=_to_json).encode()
+    header = BINARY_RECORD_HEADER.pack(-1 if offset is None else offset, timestamp, is_binary, len(encoded_tags))
+    body = header + encoded_tags + payload
+    return BINARY_RECORD_LENGTH.pack(len(body)) + body
+
 
-        return handler
+def read_binary_records(file):
+    """Yield (offset, timestamp, metadata, data) for each record in a binary file written by the sink."""
+    while True:
+        length = file.read(BINARY_RECORD_LENGTH.size)
+        if not length:
+            return
+        body = file.read(BINARY_RECORD_LENGTH.unpack(length)[0])
+        offset, timestamp, is_binary, tags_length = BINARY_RECORD_HEADER.unpack_from(body)
+        tags_end = BINARY_RECORD_HEADER.size + tags_length
+        tags = json.loads(body[BINARY_RECORD_HEADER.size:tags_end])
+        payload = body[tags_end:] if is_binary else json.loads(body[tags_end:])
+        yield None if offset < 0 else offset, timestamp, tags, payload
@@ -19,18 +19,52 @@
 # Boston, MA 02110-1301, USA.
 #
 
+import ast
+import asyncio
+import collections
+import collections.abc
+import concurrent.futures
 import enum
+import functools
+import inspect
+import multiprocessing
+import queue
+import reprlib
 import textwrap
-import types
+import threading
+import time
+import traceback
 
+import numpy
 import pmt
 from gnuradio import gr
 
+try:
+    from .kernels import iterate_results
+except ImportError:  # imported as a top level module, e.g. by the QA tests
+    from kernels import iterate_results
+
+# number of recent snippet calls the percentiles of the processing time are calculated from
+PROCESSING_TIME_WINDOW = 1000
+# seconds stop() waits for the calls of snippets with await without a time budget, before cancelling them
+SHUTDOWN_TIMEOUT = 5
+
 
 class MessageType(enum.Enum):
     RAW = 'raw'
     PYTHON = 'python'
     PDU = 'pdu'
+    PDU_VIEW = 'pdu_view'
+
+
+class WorkerType(enum.Enum):
+    THREAD = 'thread'
+    PROCESS = 'process'
+
+
+class OverrunPolicy(enum.Enum):
+    ABANDON = 'abandon'
+    SLOW_LANE = 'slow_lane'
 
 
 class binary_message_processor(gr.basic_block):
@@ -38,7 +72,9 @@ class binary_message_processor(gr.basic_block):
     docstring for block binary_message_processor
     """
 
-    def __init__(self, in_type=MessageType.PDU, out_type=MessageType.PDU, code='pass'):
+    def __init__(self, in_type=MessageType.PDU, out_type=MessageType.PDU, code='pass', batch_size=1,
+                 batch_timeout_ms=0, workers=0, worker_type=WorkerType.THREAD, ordered_output=True,
+                 max_concurrency=16, time_budget_ms=0, overrun_policy=OverrunPolicy.SLOW_LANE, slow_lane_size=2):
         gr.basic_block.__init__(self,
                                 name="binary_message_processor",
                                 in_sig=None,
@@ -50,6 +86,8 @@ class binary_message_processor(gr.basic_block):
             self._decoder = self._python_decoder
         elif in_type == MessageType.PDU:
             self._decoder = self._pdu_decoder
+        elif in_type == MessageType.PDU_VIEW:
+            self._decoder = self._pdu_view_decoder
         else:
             raise ValueError(f'Unknown in_type {in_type}')
 
@@ -57,34 +95,284 @@ class binary_message_processor(gr.basic_block):
             self._encoder = self._raw_encoder
         elif out_type == MessageType.PYTHON:
             self._encoder = self._python_encoder
-        elif out_type == MessageType.PDU:
+        elif out_type in (MessageType.PDU, MessageType.PDU_VIEW):
             self._encoder = self._pdu_encoder
         else:
             raise ValueError(f'Unknown out_type {out_type}')
-        new_locals = {}
-        if in_type == MessageType.PDU:
+        if worker_type not in (WorkerType.THREAD, WorkerType.PROCESS):
+            raise ValueError(f'Unknown worker_type {worker_type}')
+        if workers > 0 and worker_type == WorkerType.PROCESS and MessageType.RAW in (in_type, out_type):
+            raise ValueError('Raw PMT messages cannot be passed to worker processes')
+        self._batch_size = batch_size
+        self._batch_timeout_ms = batch_timeout_ms
+        self._batch = []
+        self._batch_lock = threading.Lock()
+        self._batch_timer = None
+        self._is_pdu_input = in_type in (MessageType.PDU, MessageType.PDU_VIEW)
+
+        self._workers = workers
+        self._worker_type = worker_type
+        self._ordered_output = ordered_output
+        self._executor = None
+        # (future, args) of the snippet calls in the order of the messages, until their results are published
+        self._pending_results = collections.deque()
+        self._results_lock = threading.Lock()
+        self._busy_time = 0
+        self._start_time = time.perf_counter()
+
+        if batch_size > 1:
+            header = 'def process(batch, stacked_data):\n' if self._is_pdu_input else 'def process(batch):\n'
+        elif self._is_pdu_input:
             header = 'def process(tags, data):\n'
         else:
             header = 'def process(message):\n'
-        exec(header + textwrap.indent(code, prefix='    '), globals(), new_locals)
+        self._is_async = is_async_code(code)
+        if self._is_async:
+            if workers > 0:
+                raise ValueError('Snippets with await run on the event loop of the block, not in workers')
+            header = 'async ' + header
+        self._code = header + textwrap.indent(code, prefix='    ')
+        self._processor = compile_processor(self._code)
+        self._max_concurrency = max_concurrency
+        self._concurrency = threading.Semaphore(max_concurrency)
+        self._loop = None
+        self._loop_thread = None
 
-        self._processor = new_locals['process']
+        self._time_budget_ms = time_budget_ms
+        self._overrun_policy = overrun_policy
+        self._overruns = 0
+        # runs the snippet for the message handler, which stops waiting for it after the time budget
+        self._lane = None
+        # lanes with an overrunning call, which have been replaced by a new lane for the message handler
+        self._slow_lanes = set()
+        self._slow_lane_size = slow_lane_size
+        self._slow_lane_lock = threading.Lock()
+        self._dropped_messages = 0
+        self._is_stopped = False
+        self._processing_times = collections.deque(maxlen=PROCESSING_TIME_WINDOW)
+        self._max_processing_time = 0
 
         self.message_port_register_in(pmt.intern('in'))
         self.message_port_register_out(pmt.intern('out'))
         self.set_msg_handler(pmt.intern('in'), self._handle_message)
 
+    def start(self):
+        if self._is_async:
+            self._loop = asyncio.new_event_loop()
+            self._loop_thread = threading.Thread(target=self._loop.run_forever, name='binary_message_processor',
+                                                 daemon=True)
+            self._loop_thread.start()
+        elif self._workers > 0 and self._worker_type == WorkerType.THREAD:
+            self._executor = concurrent.futures.ThreadPoolExecutor(self._workers)
+        elif self._workers > 0:
+            # forking the multi-threaded flowgraph process is unsafe
+            self._executor = concurrent.futures.ProcessPoolExecutor(self._workers, multiprocessing.get_context('spawn'),
+                                                                    _init_worker, (self._code,))
+        elif self._time_budget_ms > 0:
+            self._lane = Lane()
+        self._is_stopped = False
+        self._busy_time = 0
+        self._start_time = time.perf_counter()
+        return True
+
+    def stop(self):
+        with self._batch_lock:
+            self._process_batch()
+        if self._executor is not None:
+            # the results of all pending calls are published before the executor shuts down
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        with self._slow_lane_lock:
+            # calls in the slow lane are not waited for, they might never return
+            self._is_stopped = True
+            if self._lane is not None:
+                self._lane.close()
+                self._lane = None
+        if self._loop is not None:
+            # the callbacks on the loop remove finished calls from the pending results at the same time
+            with self._results_lock:
+                futures = [future for future, _ in self._pending_results]
+            timeout = self._time_budget_ms / 1000 if self._time_budget_ms > 0 else SHUTDOWN_TIMEOUT
+            _, not_done = concurrent.futures.wait(futures, timeout=timeout)
+            if not_done:
+                print(f'binary_message_processor: cancelling {len(not_done)} calls still running at stop')
+                # a snippet that ignores the cancellation must not block the stop either
+                cancelled = asyncio.run_coroutine_threadsafe(_cancel_tasks(), self._loop)
+                concurrent.futures.wait([cancelled], timeout=timeout)
+            # the results are published by callbacks on the loop, which run before it stops
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join()
+            self._loop.close()
+            self._loop = None
+        return True
+
+    def queue_depth(self):
+        """Number of snippet calls waiting for a worker or, with ordered output, for earlier calls to finish."""
+        return len(self._pending_results)
+
+    def worker_utilization(self):
+        """
+        Fraction of the time since the start the workers (or the message handler) spent running the snippet. For
+        snippets with await, the fraction of max_concurrency used on average.
+        """
+        slots = self._max_concurrency if self._is_async else max(self._workers, 1)
+        return self._busy_time / (slots * (time.perf_counter() - self._start_time))
+
+    def overruns(self):
+        """Number of snippet calls that exceeded the time budget."""
+        return self._overruns
+
+    def dropped_messages(self):
+        """Number of messages dropped because the lane and all slots of the slow lane were taken by overruns."""
+        return self._dropped_messages
+
+    def processing_time_stats(self):
+        """Median and 99th percentile of the recent snippet calls and the maximum of all, in ms."""
+        processing_times = numpy.array(self._processing_times)
+        if len(processing_times) == 0:
+            return {'p50': 0., 'p99': 0., 'max': 0.}
+        p50, p99 = numpy.percentile(processing_times, (50, 99)) * 1000
+        return {'p50': float(p50), 'p99': float(p99), 'max': self._max_processing_time * 1000}
+
     def _handle_message(self, message):
         args = self._decoder(message)
-        result = self._processor(*args)
-        if result is not None:
-            if isinstance(result, types.GeneratorType):
-                for result_item in result:
-                    encoded_result = self._encoder(result_item)
-                    self.message_port_pub(pmt.intern('out'), encoded_result)
+        if self._batch_size <= 1:
+            self._run(args, is_batch=False)
+            return
+        with self._batch_lock:
+            self._batch.append(args)
+            if len(self._batch) >= self._batch_size:
+                self._process_batch()
+            elif len(self._batch) == 1 and self._batch_timeout_ms > 0:
+                self._batch_timer = threading.Timer(self._batch_timeout_ms / 1000, self._handle_batch_timeout)
+                self._batch_timer.daemon = True
+                self._batch_timer.start()
+
+    def _handle_batch_timeout(self):
+        with self._batch_lock:
+            # the batch this timer was started for might have been processed in the meantime
+            if self._batch_timer is threading.current_thread():
+                self._process_batch()
+
+    def _process_batch(self):
+        """Run the snippet for the collected messages, the caller must hold the batch lock."""
+        if self._batch_timer is not None:
+            self._batch_timer.cancel()
+            self._batch_timer = None
+        if not self._batch:
+            return
+        batch, self._batch = self._batch, []
+        if self._is_pdu_input:
+            self._run((batch, stack_data([data for _, data in batch])), is_batch=True)
+        else:
+            self._run(([message for message, in batch],), is_batch=True)
+
+    def _run(self, args, is_batch):
+        if self._loop is not None:
+            # blocks the message handler while max_concurrency calls are in flight
+            self._concurrency.acquire()
+            future = asyncio.run_coroutine_threadsafe(collect_async_results(self._processor, args, is_batch),
+                                                      self._loop)
+            future.add_done_callback(lambda _: self._concurrency.release())
+        elif self._time_budget_ms > 0 and self._executor is None:
+            self._run_in_lane(args, is_batch)
+            return
+        elif self._executor is None:
+            duration, results = collect_results(self._processor, args, is_batch)
+            self._record_processing_time(duration, args)
+            self._publish(results)
+            return
+        elif self._worker_type == WorkerType.PROCESS:
+            future = self._executor.submit(_collect_worker_results, args, is_batch)
+        else:
+            future = self._executor.submit(collect_results, self._processor, args, is_batch)
+        with self._results_lock:
+            self._pending_results.append((future, args))
+        future.add_done_callback(self._handle_done)
+
+    def _run_in_lane(self, args, is_batch):
+        lane = self._lane
+        if lane is None:
+            # the slow lane is full, another thread per overrun could pile up without bound
+            self._dropped_messages += 1
+            return
+        future = lane.submit(collect_results, self._processor, args, is_batch)
+        try:
+            duration, results = future.result(timeout=self._time_budget_ms / 1000)
+        except concurrent.futures.TimeoutError:
+            self._overruns += 1
+            self._log_overrun(args)
+            # a running call cannot be interrupted, so its lane moves to the slow lane and the next messages get
+            # a new one, unless the slow lane is full: the call in a new lane could be late as well, which would
+            # make one more than slow_lane_size late calls
+            with self._slow_lane_lock:
+                self._slow_lanes.add(lane)
+                self._lane = Lane() if len(self._slow_lanes) < self._slow_lane_size and not self._is_stopped else None
+            future.add_done_callback(functools.partial(self._handle_slow_lane_done, lane))
+            return
+        self._record_processing_time(duration)
+        self._publish(results)
+
+    def _handle_slow_lane_done(self, lane, future):
+        with self._slow_lane_lock:
+            self._slow_lanes.discard(lane)
+            if self._lane is None and not self._is_stopped:
+                # the message handler was dropping messages, now it can use this lane again
+                self._lane = lane
             else:
-                encoded_result = self._encoder(result)
-                self.message_port_pub(pmt.intern('out'), encoded_result)
+                lane.close()
+        try:
+            duration, results = future.result()
+        except Exception:
+            traceback.print_exc()
+            return
+        self._record_processing_time(duration)
+        if self._overrun_policy == OverrunPolicy.SLOW_LANE:
+            self._publish(results)
+
+    def _record_processing_time(self, duration, args=None):
+        """Record the time of a finished call, and count an overrun if it was not noticed while it was running."""
+        self._busy_time += duration
+        self._processing_times.append(duration)
+        self._max_processing_time = max(self._max_processing_time, duration)
+        if args is not None and 0 < self._time_budget_ms < duration * 1000:
+            self._overruns += 1
+            self._log_overrun(args)
+            return False
+        return True
+
+    def _log_overrun(self, args):
+        action = 'abandoned' if self._overrun_policy == OverrunPolicy.ABANDON else 'moved to the slow lane'
+        print(f'binary_message_processor: exceeded time budget of {self._time_budget_ms} ms, {action}: '
+              f'{reprlib.repr(args)}')
+
+    def _handle_done(self, future):
+        # called by the worker threads or the management thread of the process pool
+        with self._results_lock:
+            if not self._ordered_output:
+                index = next(i for i, (pending, _) in enumerate(self._pending_results) if pending is future)
+                self._publish_future(*self._pending_results[index])
+                del self._pending_results[index]
+                return
+            while self._pending_results and self._pending_results[0][0].done():
+                self._publish_future(*self._pending_results.popleft())
+
+    def _publish_future(self, future, args):
+        try:
+            duration, results = future.result()
+        except concurrent.futures.CancelledError:
+            return
+        except Exception:
+            traceback.print_exc()
+            return
+        # workers are not waited for, so an overrun is only noticed when the call returns
+        if self._record_processing_time(duration, args) or self._overrun_policy == OverrunPolicy.SLOW_LANE:
+            self._publish(results)
+
+    def _publish(self, results):
+        for result_item in results:
+            encoded_result = self._encoder(result_item)
+            self.message_port_pub(pmt.intern('out'), encoded_result)
 
     @staticmethod
     def _raw_decoder(message):
@@ -100,6 +388,15 @@ class binary_message_processor(gr.basic_block):
         data = pmt.to_python(pmt.cdr(message))
         return tags, data
 
+    @staticmethod
+    def _pdu_view_decoder(message):
+        metadata = pmt.car(message)
+        if pmt.is_dict(metadata) and not pmt.is_null(metadata):
+            tags = PduTags(metadata)
+        else:
+            tags = pmt.to_python(metadata)
+        return tags, decode_data(pmt.cdr(message))
+
     @staticmethod
     def _raw_encoder(message):
         return message
@@ -111,4 +408,181 @@ class binary_message_processor(gr.basic_block):
     @staticmethod
     def _pdu_encoder(result):
         (tags, data) = result
-        return pmt.cons(pmt.to_pmt(tags), pmt.to_pmt(data))
+        metadata = tags.to_pmt() if isinstance(tags, PduTags) else pmt.to_pmt(tags)
+        return pmt.cons(metadata, encode_data(data))
+
+
+class Lane:
+    """
+    Runs one call after the other in a daemon thread. Unlike the threads of concurrent.futures, it is not joined at
+    the exit of the interpreter, so a call that never returns does not keep the process from exiting.
+    """
+
+    def __init__(self):
+        self._calls = queue.SimpleQueue()
+        threading.Thread(target=self._run_calls, name='binary_message_processor', daemon=True).start()
+
+    def submit(self, function, *args):
+        """Queue a call and return a concurrent.futures.Future of its result."""
+        future = concurrent.futures.Future()
+        self._calls.put((future, function, args))
+        return future
+
+    def close(self):
+        """Stop the thread after the queued calls."""
+        self._calls.put(None)
+
+    def _run_calls(self):
+        while True:
+            call = self._calls.get()
+            if call is None:
+                return
+            future, function, args = call
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(function(*args))
+                except BaseException as exception:
+                    future.set_exception(exception)
+
+
+class PduTags(collections.abc.MutableMapping):
+    """
+    Metadata of a PDU, which converts a value to Python only when it is accessed. Unless values were accessed,
+    changed or deleted, the metadata is encoded again without any conversion.
+    """
+
+    def __init__(self, metadata):
+        self._metadata = metadata
+        # values that were accessed or assigned, they might have been changed in place
+        self._values = {}
+        self._deleted = set()
+
+    def __getitem__(self, key):
+        if key in self._values:
+            return self._values[key]
+        pmt_key = pmt.to_pmt(key)
+        if key in self._deleted or not pmt.dict_has_key(self._metadata, pmt_key):
+            raise KeyError(key)
+        value = pmt.to_python(pmt.dict_ref(self._metadata, pmt_key, pmt.PMT_NIL))
+        self._values[key] = value
+        return value
+
+    def __setitem__(self, key, value):
+        self._values[key] = value
+        self._deleted.discard(key)
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self._values.pop(key, None)
+        self._deleted.add(key)
+
+    def __iter__(self):
+        keys = [pmt.to_python(key) for key in pmt.dict_keys(self._metadata)]
+        yield from (key for key in keys if key not in self._deleted)
+        yield from (key for key in list(self._values) if key not in keys)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+    def __reduce__(self):
+        # e.g. to send it to a worker process, which has no access to the PMT
+        return dict, (dict(self),)
+
+    def to_pmt(self):
+        metadata = self._metadata
+        for key in self._deleted:
+            metadata = pmt.dict_delete(metadata, pmt.to_pmt(key))
+        for key, value in self._values.items():
+            metadata = pmt.dict_add(metadata, pmt.to_pmt(key), pmt.to_pmt(value))
+        return metadata
+
+
+def decode_data(vector):
+    """Data of a PDU, with a u8vector converted in one call instead of the type lookups of pmt.to_python."""
+    if pmt.is_u8vector(vector):
+        return numpy.array(pmt.u8vector_elements(vector), dtype=numpy.uint8)
+    return pmt.to_python(vector)
+
+
+def encode_data(data):
+    """Data of a PDU, with a uint8 array converted in one call instead of the type lookups of pmt.to_pmt."""
+    if isinstance(data, numpy.ndarray) and data.dtype == numpy.uint8 and data.ndim == 1:
+        return pmt.init_u8vector(len(data), data.tolist())
+    return pmt.to_pmt(data)
+
+
+def stack_data(data):
+    """Stack the data of a batch of PDUs into a 2D array, or None if they differ in length or are no arrays."""
+    if not all(isinstance(item, numpy.ndarray) and item.ndim == 1 for item in data) \
+            or len({len(item) for item in data}) != 1:
+        return None
+    return numpy.stack(data)
+
+
+def compile_processor(code):
+    """Define the process function of a snippet, which sees the globals of this module, e.g. pmt and numpy."""
+    new_locals = {}
+    exec(code, globals(), new_locals)
+    return new_locals['process']
+
+
+def collect_results(processor, args, is_batch):
+    """Run the snippet and return the time it took and its results as list, which can be sent between processes."""
+    start = time.perf_counter()
+    results = processor(*args)
+    if is_batch:
+        results = list(() if results is None else results)
+    else:
+        results = list(iterate_results(results))
+    return time.perf_counter() - start, results
+
+
+async def collect_async_results(processor, args, is_batch):
+    """Like collect_results, for snippets with await, which return a coroutine or an async generator."""
+    start = time.perf_counter()
+    results = processor(*args)
+    if inspect.isasyncgen(results):
+        results = [result async for result in results]
+    else:
+        # the snippet might return the coroutine of an async function defined in it
+        while inspect.isawaitable(results):
+            results = await results
+        results = list(() if results is None else results) if is_batch else list(iterate_results(results))
+    return time.perf_counter() - start, results
+
+
+async def _cancel_tasks():
+    """Cancels all other tasks on the running loop and waits until they finished."""
+    tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def is_async_code(code):
+    """Whether a snippet defines async functions or uses await, async for or async with outside of other functions."""
+    nodes = list(ast.parse(code).body)
+    while nodes:
+        node = nodes.pop()
+        if isinstance(node, (ast.Await, ast.AsyncFor, ast.AsyncWith, ast.AsyncFunctionDef)):
+            return True
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef)):
+            nodes.extend(ast.iter_child_nodes(node))
+    return False
+
+
+_worker_processor = None
+
+
+def _init_worker(code):
+    # snippets cannot be pickled, so each worker process compiles its own
+    global _worker_processor
+    _worker_processor = compile_processor(code)
+
+
+def _collect_worker_results(args, is_batch):
+    return collect_results(_worker_processor, args, is_batch)
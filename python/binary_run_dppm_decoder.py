@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2026 Thomas Reifenberger.
+#
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+#
+import numpy
+from gnuradio import gr
+
+try:
+    from .binary_dppm_decoder import flush_packets
+    from .kernels import LEVEL, DppmDecoder, OverflowPolicy, run_positions
+except ImportError:  # imported as a top level module, e.g. by the QA tests
+    from binary_dppm_decoder import flush_packets
+    from kernels import LEVEL, DppmDecoder, OverflowPolicy, run_positions
+
+
+class binary_run_dppm_decoder(gr.basic_block):
+    """
+    Same as binary_dppm_decoder, but for a stream of (level, run_length) records as created by
+    binary_run_length_encoder.
+    """
+
+    def __init__(self, samples_per_pulse=10, samples_per_gap=(10, 20), max_deviation=1, max_packet_length=64,
+                 max_queued_symbols=65536):
+        gr.basic_block.__init__(self,
+                                name="binary_run_dppm_decoder",
+                                in_sig=[(numpy.int32, 2), ],
+                                out_sig=[numpy.int8, ])
+        # input that would not fit into the queue is held back, so no packets are dropped
+        self._decoder = DppmDecoder(samples_per_pulse, samples_per_gap, max_deviation, max_packet_length,
+                                    max_queued_symbols, OverflowPolicy.DROP_OLDEST)
+        self._max_packet_length = max_packet_length
+        self._max_queued_symbols = max_queued_symbols
+        self._position = 0
+
+        self.set_output_multiple(self._max_packet_length)
+
+    def forecast(self, noutput_items, ninput_items_required):
+        # setup size of input_items[i] for work call, each symbol is made of a pulse and a gap
+        for i in range(len(ninput_items_required)):
+            ninput_items_required[i] = (noutput_items - self._max_packet_length + 1) * 2
+
+    def general_work(self, input_items, output_items):
+        in0 = input_items[0]
+        out0 = output_items[0]
+
+        positions = run_positions(in0, self._position)
+        is_signal = in0[:, LEVEL] != 0
+        # an edge is located at the last sample before a run with a different level than the previous run
+        edge_runs = numpy.flatnonzero(is_signal[1:] != is_signal[:-1]) + 1
+
+        # input that would not fit into the queue or the output is held back
+        processed_edges = self._decoder.decode_edges(positions[edge_runs] - 1, is_signal[edge_runs],
+                                                     min(len(out0), self._max_queued_symbols))
+        self._decoder.finish_timed_out_packet(positions[-1] - 1)
+
+        # keep the run before the next edge, so that the edge is seen again in the next call
+        if processed_edges == len(edge_runs):
+            consumed = max(len(in0) - 1, 0)
+        else:
+            consumed = int(edge_runs[processed_edges]) - 1
+        self._position = int(positions[consumed])
+        sent_symbols = flush_packets(self, self._decoder, out0)
+
+        self.consume(0, consumed)
+        return sent_symbols
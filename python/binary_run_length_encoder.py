@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2026 Thomas Reifenberger.
+#
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+#
+import numpy
+from gnuradio import gr
+
+try:
+    from .kernels import LEVEL, LENGTH, run_length_encode
+except ImportError:  # imported as a top level module, e.g. by the QA tests
+    from kernels import LEVEL, LENGTH, run_length_encode
+
+
+class binary_run_length_encoder(gr.basic_block):
+    """
+    Converts a stream of samples into a stream of (level, run_length) records, one for each run of zero or non-zero
+    samples. A run that continues over the end of the input of one call is split into several records of the same
+    level.
+    """
+
+    def __init__(self):
+        gr.basic_block.__init__(self,
+                                name="binary_run_length_encoder",
+                                in_sig=[numpy.int8, ],
+                                out_sig=[(numpy.int32, 2), ])
+
+    def forecast(self, noutput_items, ninput_items_required):
+        # setup size of input_items[i] for work call
+        for i in range(len(ninput_items_required)):
+            ninput_items_required[i] = noutput_items
+
+    def general_work(self, input_items, output_items):
+        in0 = input_items[0]
+        out0 = output_items[0]
+
+        levels, lengths = run_length_encode(in0)
+        runs = min(len(lengths), len(out0))
+        out0[:runs, LEVEL] = levels[:runs]
+        out0[:runs, LENGTH] = lengths[:runs]
+
+        self.consume(0, int(numpy.sum(lengths[:runs])))
+        return runs
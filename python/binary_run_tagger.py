@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2026 Thomas Reifenberger.
+#
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+#
+import numpy
+from gnuradio import gr
+import pmt
+
+try:
+    from .kernels import LEVEL, TransmissionDetector, run_positions
+except ImportError:  # imported as a top level module, e.g. by the QA tests
+    from kernels import LEVEL, TransmissionDetector, run_positions
+
+
+class binary_run_tagger(gr.sync_block):
+    """
+    Same as binary_tagger, but for a stream of (level, run_length) records as created by binary_run_length_encoder.
+    Each tag is added to the record that contains the sample where the transmission starts or ends.
+    """
+
+    def __init__(self, key='binary_transmission', max_quiet_samples=100):
+        gr.sync_block.__init__(self,
+                               name="binary_run_tagger",
+                               in_sig=[(numpy.int32, 2), ],
+                               out_sig=[(numpy.int32, 2), ])
+
+        self._key = key
+        self._detector = TransmissionDetector(max_quiet_samples)
+        self._position = 0
+
+    def work(self, input_items, output_items):
+        in0 = input_items[0]
+        out = output_items[0]
+
+        positions = run_positions(in0, self._position)
+        signal_runs = numpy.flatnonzero(in0[:, LEVEL])
+        for position, is_transmission in self._detector.process(positions[signal_runs], positions[signal_runs + 1] - 1,
+                                                                positions[-1]):
+            run = numpy.searchsorted(positions, position, side='right') - 1
+            self.add_item_tag(0, self.nitems_written(0) + int(run), pmt.string_to_symbol(self._key),
+                              pmt.to_pmt(is_transmission))
+        self._position = int(positions[-1])
+
+        out[:] = in0
+
+        return len(output_items[0])
@@ -24,6 +24,11 @@ import numpy
 from gnuradio import gr
 import pmt
 
+try:
+    from .kernels import TransmissionDetector
+except ImportError:  # imported as a top level module, e.g. by the QA tests
+    from kernels import TransmissionDetector
+
 
 class binary_tagger(gr.sync_block):
     """
@@ -37,35 +42,18 @@ class binary_tagger(gr.sync_block):
                                out_sig=[numpy.int8, ])
 
         self._key = key
-        self._max_quiet_samples = max_quiet_samples
-        self._is_transmission = False
-        self._position_of_last_signal = -1
+        self._detector = TransmissionDetector(max_quiet_samples)
 
     def work(self, input_items, output_items):
         in0 = input_items[0]
         out = output_items[0]
 
-        if not self._can_input_be_skipped(in0):  # shortcut to skip empty inputs for better performance
-            self._scan_for_transmissions(in0)
+        offset = self.nitems_written(0)
+        signal_positions = numpy.flatnonzero(in0) + offset
+        for position, is_transmission in self._detector.process(signal_positions, signal_positions,
+                                                                offset + len(in0)):
+            self.add_item_tag(0, position, pmt.string_to_symbol(self._key), pmt.to_pmt(is_transmission))
 
         out[:] = in0
 
         return len(output_items[0])
-
-    def _can_input_be_skipped(self, in0):
-        return not self._is_transmission and numpy.all(in0 == 0)
-
-    def _scan_for_transmissions(self, in0):
-        offset = self.nitems_written(0)
-        for i, value in enumerate(in0):
-            position = offset + i
-            if value != 0:
-                self._position_of_last_signal = position
-            if not self._is_transmission:
-                if value != 0:
-                    self.add_item_tag(0, position, pmt.string_to_symbol(self._key), pmt.to_pmt(True))
-                    self._is_transmission = True
-            else:
-                if position - self._position_of_last_signal > self._max_quiet_samples:
-                    self._is_transmission = False
-                    self.add_item_tag(0, position, pmt.string_to_symbol(self._key), pmt.to_pmt(False))
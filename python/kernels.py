@@ -0,0 +1,569 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2026 Thomas Reifenberger.
+#
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+#
+"""
+The decoding logic of the blocks as plain, stateful classes and functions, which only depend on NumPy. They can be
+used without GNU Radio, e.g. in batch jobs, notebooks or worker processes. Each block is a thin wrapper around one
+of them.
+"""
+import bisect
+import collections
+import enum
+import itertools
+import types
+
+import numpy
+
+LEVEL = 0
+LENGTH = 1
+
+PACKET_LENGTH_TAG_KEY = 'packet_len'
+PACKET_OFFSET_KEY = 'packet_offset'
+
+
+def run_length_encode(samples):
+    """
+    Split samples into runs of zero and non-zero samples. Returns the level (0 or 1) and the length of each run.
+    """
+    if len(samples) == 0:
+        return numpy.zeros(0, dtype=numpy.int32), numpy.zeros(0, dtype=numpy.int32)
+    levels = samples != 0
+    run_starts = numpy.concatenate(([0], numpy.flatnonzero(levels[1:] != levels[:-1]) + 1))
+    run_lengths = numpy.diff(numpy.append(run_starts, len(samples)))
+    return levels[run_starts].astype(numpy.int32), run_lengths.astype(numpy.int32)
+
+
+def run_positions(runs, position):
+    """
+    Returns the absolute positions of the first sample of each run, followed by the position after the last run,
+    given the position of the first run.
+    """
+    return position + numpy.concatenate(([0], numpy.cumsum(runs[:, LENGTH], dtype=numpy.int64)))
+
+
+class OverflowPolicy(enum.Enum):
+    DROP_OLDEST = 'drop_oldest'
+    DROP_NEWEST = 'drop_newest'
+
+
+class TransmissionDetector:
+    """
+    Finds the start and end of transmissions, given the positions of signal runs. A transmission starts with a signal
+    and ends max_quiet_samples + 1 samples after its last signal, unless another signal arrives before that.
+    """
+
+    def __init__(self, max_quiet_samples):
+        self._max_quiet_samples = max_quiet_samples
+        self._is_transmission = False
+        self._position_of_last_signal = -1
+        self._position = 0
+
+    def find_bursts(self, chunk):
+        """
+        Takes the next chunk of samples and returns a list of (position, is_transmission) for all starts and ends of
+        transmissions in it, where position counts the samples of all chunks so far.
+        """
+        signal_positions = numpy.flatnonzero(chunk) + self._position
+        self._position += len(chunk)
+        return self.process(signal_positions, signal_positions, self._position)
+
+    def process(self, signal_starts, signal_ends, end_position):
+        """
+        Takes the absolute positions of the first and the last sample of each signal run and the position after the
+        last sample seen so far. Returns a list of (position, is_transmission) for all starts and ends of
+        transmissions, ordered by position.
+        """
+        if not self._is_transmission:
+            if len(signal_starts) == 0:  # shortcut to skip empty inputs for better performance
+                return []
+            starts = [signal_starts[0]]
+            gap_starts = signal_ends
+            gap_ends = signal_starts[1:]
+        else:
+            starts = []
+            # the quiet gap of an ongoing transmission starts at the last signal of previous calls
+            gap_starts = numpy.concatenate(([self._position_of_last_signal], signal_ends))
+            gap_ends = signal_starts
+
+        breaks = numpy.flatnonzero(gap_ends - gap_starts[:-1] > self._max_quiet_samples + 1)
+        ends = list(gap_starts[breaks] + self._max_quiet_samples + 1)
+        starts.extend(gap_ends[breaks])
+
+        self._is_transmission = True
+        self._position_of_last_signal = int(gap_starts[-1])
+        final_end = self._position_of_last_signal + self._max_quiet_samples + 1
+        if final_end < end_position:
+            ends.append(final_end)
+            self._is_transmission = False
+
+        return sorted(itertools.chain(((int(start), True) for start in starts), ((int(end), False) for end in ends)))
+
+
+class SymbolSynchronizer:
+    """
+    Samples symbols of a binary signal with a clock that locks onto the start of each symbol.
+    """
+
+    def __init__(self, samples_per_symbol, max_deviation, clock_smoothing_factor, max_zero_symbols,
+                 output_samples_per_symbol):
+        self._samples_per_symbol = samples_per_symbol
+        self._max_deviation = max_deviation
+        self._clock_smoothing_factor = clock_smoothing_factor
+        self._max_zero_symbols = max_zero_symbols
+        self._output_samples_per_symbol = output_samples_per_symbol
+
+        # TODO check validity of deviation
+        self._min_samples_per_symbol = self._samples_per_symbol - self._max_deviation
+        self._max_samples_per_symbol = self._samples_per_symbol + self._max_deviation
+
+        # the start of the next symbol is searched at these offsets around the expected position, in this order:
+        # 0, -1, 1, -2, 2, ... TODO check if enough
+        self._candidate_offsets = list(itertools.accumulate(((-1) ** i) * i for i in range(4 * self._max_deviation)))
+
+        # internal state
+        self._is_locked = False
+        self._current_samples_per_symbol = None
+        self._zero_symbols = 0
+        self._unprocessed_samples = numpy.zeros(0, dtype=numpy.int8)
+
+    def sync_symbols(self, chunk):
+        """
+        Takes the next chunk of samples and returns the output samples of all symbols that can be found so far.
+        The last samples are kept until the next chunk, as the end of their symbol is not known yet.
+        """
+        samples = numpy.concatenate((self._unprocessed_samples, chunk))
+        max_symbols = len(samples) // max(self._min_samples_per_symbol, 1) + 1
+        out = numpy.zeros(max_symbols * self._output_samples_per_symbol, dtype=numpy.int8)
+        consumed, produced = self.process(samples, out)
+        self._unprocessed_samples = samples[consumed:]
+        return out[:produced]
+
+    def process(self, in0, out0):
+        """
+        Write the symbols found in in0 to out0, as long as they fit. Returns the number of consumed input samples
+        and the number of written output samples.
+        """
+        signal_positions = numpy.flatnonzero(in0)
+        # a symbol can start at every signal sample that follows a zero sample
+        symbol_starts = signal_positions[in0[signal_positions - 1] == 0].tolist()
+        signal_positions = signal_positions.tolist()
+        # sentinels to find something after the last signal
+        symbol_starts.append(len(in0))
+        signal_positions.append(len(in0))
+
+        # the state and parameters are kept in local variables, as this loop runs once per symbol
+        is_locked = self._is_locked
+        current_samples_per_symbol = self._current_samples_per_symbol
+        zero_symbols = self._zero_symbols
+        max_zero_symbols = self._max_zero_symbols
+        min_samples_per_symbol = self._min_samples_per_symbol
+        max_samples_per_symbol = self._max_samples_per_symbol
+        has_candidate_offsets = len(self._candidate_offsets) > 0
+        min_candidate_offset = min(self._candidate_offsets, default=0)
+        max_candidate_offset = max(self._candidate_offsets, default=0)
+        alpha = self._clock_smoothing_factor
+        bisect_left = bisect.bisect_left
+        bisect_right = bisect.bisect_right
+
+        max_symbols = len(out0) // self._output_samples_per_symbol
+        end_position = len(in0) - max_samples_per_symbol
+        relative_position = 0
+        symbol_positions = []
+        symbol_lengths = []
+
+        while relative_position < end_position and len(symbol_positions) < max_symbols:
+            next_signal = signal_positions[bisect_left(signal_positions, relative_position)]
+            if not is_locked:
+                if next_signal > relative_position:
+                    relative_position = next_signal
+                else:
+                    is_locked = True
+                    current_samples_per_symbol = self._samples_per_symbol
+            elif zero_symbols > max_zero_symbols:
+                is_locked = False
+                zero_symbols = 0
+            elif next_signal > relative_position + max_samples_per_symbol:
+                # no symbol can start before the next signal, so skip zero symbols until the lock is lost
+                length = int(current_samples_per_symbol)
+                count = min(max_zero_symbols - zero_symbols + 1,
+                            max_symbols - len(symbol_positions),
+                            (next_signal - max_samples_per_symbol - relative_position - 1) // length + 1)
+                symbol_positions.extend(range(relative_position, relative_position + count * length, length))
+                symbol_lengths.extend([length] * count)
+                zero_symbols += count
+                relative_position += count * length
+            else:
+                # The candidate offsets cover the range between their minimum and maximum, and the one with the
+                # smallest absolute value wins, negative before positive. So only the closest symbol starts at or
+                # before and after the expected position need to be considered.
+                expected_position = relative_position + int(current_samples_per_symbol + 0.5)
+                index = bisect_right(symbol_starts, expected_position)
+                earlier_start = symbol_starts[index - 1] if index > 0 else -1
+                if earlier_start < max(expected_position + min_candidate_offset,
+                                       relative_position + min_samples_per_symbol):
+                    earlier_start = None
+                later_start = symbol_starts[index]
+                if later_start > min(expected_position + max_candidate_offset,
+                                     relative_position + max_samples_per_symbol):
+                    later_start = None
+                if earlier_start is not None and \
+                        (later_start is None or expected_position - earlier_start <= later_start - expected_position):
+                    length = earlier_start - relative_position
+                elif later_start is not None:
+                    length = later_start - relative_position
+                else:
+                    length = None
+                if length is not None and has_candidate_offsets:
+                    current_samples_per_symbol = alpha * length + (1 - alpha) * current_samples_per_symbol
+                else:
+                    length = int(current_samples_per_symbol)
+
+                if next_signal < relative_position + length:
+                    zero_symbols = 0
+                else:
+                    zero_symbols += 1
+                symbol_positions.append(relative_position)
+                symbol_lengths.append(length)
+                relative_position += length
+
+        self._is_locked = is_locked
+        self._current_samples_per_symbol = current_samples_per_symbol
+        self._zero_symbols = zero_symbols
+
+        symbols_written = len(symbol_positions)
+        if symbols_written > 0:
+            sample_offsets = (numpy.array(symbol_lengths)[:, numpy.newaxis] *
+                              numpy.arange(self._output_samples_per_symbol)) / self._output_samples_per_symbol
+            sample_positions = numpy.array(symbol_positions)[:, numpy.newaxis] + sample_offsets.astype(int)
+            out0[:symbols_written * self._output_samples_per_symbol] = in0[sample_positions.ravel()]
+
+        return relative_position, symbols_written * self._output_samples_per_symbol
+
+
+class EdgeDetector:
+    """
+    Finds the rising and falling edges of a binary signal from its signal samples only, so quiet samples cost
+    nothing but the scan for signal samples. Edges get the same positions as in numpy.diff of the whole signal, i.e.
+    a rising edge is at the zero sample before a pulse and a falling edge at the last sample of a pulse.
+    """
+
+    def __init__(self):
+        # None before the first sample, which is not preceded by an edge
+        self._last_sample_is_signal = None
+
+    def process(self, in0, position):
+        """Returns the absolute positions of all edges before the last sample of in0, and whether they are rising."""
+        if len(in0) == 0:
+            # the state only depends on the last sample, which is still the one of the previous input
+            return numpy.zeros(0, dtype=numpy.int64), numpy.zeros(0, dtype=bool)
+        signal_positions = numpy.flatnonzero(in0)
+        is_pulse_start = numpy.empty(len(signal_positions), dtype=bool)
+        is_pulse_start[1:] = numpy.diff(signal_positions) > 1
+        is_pulse_end = numpy.empty(len(signal_positions), dtype=bool)
+        is_pulse_end[:-1] = is_pulse_start[1:]
+        if len(signal_positions) > 0:
+            is_pulse_start[0] = signal_positions[0] > 0 or self._last_sample_is_signal is False
+            # a falling edge at the last sample is only known with the next sample
+            is_pulse_end[-1] = signal_positions[-1] < len(in0) - 1
+        rising_edges = signal_positions[is_pulse_start] - 1
+        falling_edges = signal_positions[is_pulse_end]
+        if self._last_sample_is_signal and (len(signal_positions) == 0 or signal_positions[0] > 0):
+            # the pulse at the end of the previous input ended with its last sample
+            falling_edges = numpy.concatenate(([-1], falling_edges))
+        self._last_sample_is_signal = bool(in0[-1])
+
+        edges = numpy.concatenate((rising_edges, falling_edges))
+        order = numpy.argsort(edges, kind='stable')
+        is_rising = numpy.arange(len(edges)) < len(rising_edges)
+        return edges[order] + position, is_rising[order]
+
+
+class DppmDecoder:
+    """
+    Decodes DPPM symbols from the positions of rising and falling edges and collects them into packets.
+    """
+
+    def __init__(self, samples_per_pulse, samples_per_gap, max_deviation, max_packet_length, max_queued_symbols,
+                 overflow_policy):
+        self._samples_per_pulse = samples_per_pulse
+        self._samples_per_gap = numpy.array(list(samples_per_gap))
+        self._max_deviation = max_deviation
+        self._max_packet_length = max_packet_length
+        self._max_queued_symbols = max_queued_symbols
+        self._overflow_policy = overflow_policy
+        self._validate_parameters()
+
+        # symbol for each gap length, -1 for invalid gaps
+        self._symbol_lookup_table = numpy.full(max(self._samples_per_gap) + self._max_deviation + 1, -1)
+        for symbol, expected_samples in reversed(list(enumerate(self._samples_per_gap))):
+            self._symbol_lookup_table[max(expected_samples - self._max_deviation, 0):
+                                      expected_samples + self._max_deviation + 1] = symbol
+
+        # internal state
+        self._last_positive_edge = None
+        self._last_negative_edge = None
+        self._pending_symbol = None
+        self._pending_packet = numpy.zeros(self._max_packet_length, dtype=numpy.int8)
+        self._pending_packet_length = 0
+        self._pending_packet_offset = None
+        # positions of the last three edges, which belong to the first symbols that are pushed with the next edges
+        self._recent_positions = numpy.full(3, -1)
+        self._edges = EdgeDetector()
+        self._position = 0
+        self.output_queue = PacketRingBuffer(self._max_queued_symbols, self._overflow_policy)
+
+    def decode_dppm(self, chunk):
+        """
+        Takes the next chunk of samples and returns a list of (offset, packet) for all packets finished so far,
+        where offset counts the samples of all chunks so far. The queue never overflows, as it is emptied after each
+        batch of edges.
+        """
+        positions, is_rising = self._edges.process(chunk, self._position)
+        self._position += len(chunk)
+        packets = []
+        processed_edges = 0
+        while True:
+            processed_edges += self.decode_edges(positions[processed_edges:], is_rising[processed_edges:],
+                                                 self._max_queued_symbols)
+            if processed_edges == len(positions):
+                # an edge at the last sample is only known with the next sample
+                self.finish_timed_out_packet(self._position - 1)
+            packets.extend(self.pop_packets())
+            if processed_edges == len(positions):
+                return packets
+
+    def pop_packets(self):
+        """Removes all packets from the output queue and returns them as a list of (offset, packet)."""
+        packets = []
+        while len(self.output_queue) > 0:
+            offset = self.output_queue.peek_offset()
+            packet = numpy.zeros(self.output_queue.peek_length(), dtype=numpy.int8)
+            self.output_queue.pop(packet)
+            packets.append((offset, packet))
+        return packets
+
+    def _validate_parameters(self):
+        if self._samples_per_pulse < 1 or not isinstance(self._samples_per_pulse, int):
+            raise ValueError('samples_per_pulse must be a positive integer')
+        if len(set(self._samples_per_gap)) < len(self._samples_per_gap) or \
+                not issubclass(self._samples_per_gap.dtype.type, numpy.integer) or \
+                numpy.any(self._samples_per_gap < 1):
+            raise ValueError('samples_per_gap must be a list of distinct positive integers')
+        if len(self._samples_per_gap) < 2:
+            raise ValueError('samples_per_gap must have at least two elements')
+        if self._max_deviation < 0 or type(self._max_deviation) != int:
+            raise ValueError('max_deviation must be a non-negative integer')
+        if self._max_packet_length < 1 or not isinstance(self._max_packet_length, int):
+            raise ValueError('max_packet_length must be a positive integer')
+        if self._max_queued_symbols < self._max_packet_length or not isinstance(self._max_queued_symbols, int):
+            raise ValueError('max_queued_symbols must be an integer not smaller than max_packet_length')
+        if self._overflow_policy not in [OverflowPolicy.DROP_OLDEST, OverflowPolicy.DROP_NEWEST]:
+            raise ValueError(f'Unknown overflow_policy {self._overflow_policy}')
+        min_gap_distance = min([abs(y - x) for x, y in itertools.combinations(self._samples_per_gap, 2)])
+        if min_gap_distance <= 2 * self._max_deviation:
+            raise ValueError('difference between any 2 values in samples_per_gap must not be smaller '
+                             'than 2 * max_deviation')
+
+    def decode_edges(self, positions, is_rising, noutput_items):
+        """
+        Decode all edges at the given absolute positions at once and append the finished packets to the output
+        queue. Edges must alternate between rising and falling. Decoding stops as soon as the output queue plus one
+        more packet would not fit into noutput_items. Returns the number of processed edges.
+        """
+        max_symbols = noutput_items - self.output_queue.queued_symbols - self._max_packet_length
+        if len(positions) == 0 or max_symbols < 0:
+            return 0
+
+        is_falling = ~is_rising
+        # the previous edge is taken from the decoder state for the first edge
+        previous = numpy.empty_like(positions)
+        previous[1:] = positions[:-1]
+        if is_rising[0]:
+            has_previous = self._last_negative_edge is not None
+            previous[0] = self._last_negative_edge if has_previous else 0
+        else:
+            has_previous = self._last_positive_edge is not None
+            previous[0] = self._last_positive_edge if has_previous else 0
+        widths = positions - previous
+
+        # falling edges end a pulse started at the previous rising edge
+        has_pulse = is_falling.copy()
+        has_pulse[0] &= has_previous
+        is_valid_pulse = has_pulse & (numpy.abs(widths - self._samples_per_pulse) <= self._max_deviation)
+
+        # rising edges end a gap started at the previous falling edge, if that one ended a valid pulse
+        has_gap = numpy.zeros_like(is_rising)
+        has_gap[1:] = is_valid_pulse[:-1]
+        has_gap[0] = is_rising[0] and has_previous
+        symbols = numpy.full(len(positions), -1, dtype=numpy.int64)
+        gap_indices = numpy.flatnonzero(has_gap & (widths < len(self._symbol_lookup_table)))
+        symbols[gap_indices] = self._symbol_lookup_table[widths[gap_indices]]
+        is_valid_gap = has_gap & (symbols >= 0)
+
+        # a symbol is pushed to the current packet when the pulse following its gap is valid
+        pending_symbols = numpy.full(len(positions), -1, dtype=numpy.int64)
+        pending_symbols[1:] = numpy.where(is_valid_gap[:-1], symbols[:-1], -1)
+        if is_falling[0] and self._pending_symbol is not None:
+            pending_symbols[0] = self._pending_symbol
+        is_pushed = is_valid_pulse & (pending_symbols >= 0)
+        rotations = numpy.flatnonzero((has_gap & ~is_valid_gap) | (has_pulse & ~is_valid_pulse))
+
+        # the symbols of the current packet are continued by the pushed symbols,
+        # packets end at each rotation and after max_packet_length symbols
+        pushed = numpy.flatnonzero(is_pushed)
+        symbol_edges = numpy.concatenate((numpy.full(self._pending_packet_length, -1), pushed))
+        # a symbol starts after the rising edge of the pulse before its gap, three edges before it is pushed
+        recent_positions = numpy.concatenate((self._recent_positions, positions))
+        symbol_offsets = numpy.concatenate((numpy.full(self._pending_packet_length, self._pending_packet_offset),
+                                            recent_positions[pushed] + 1))
+        packet_symbols = numpy.concatenate((self._pending_packet[:self._pending_packet_length],
+                                            pending_symbols[pushed].astype(numpy.int8)))
+        segments = numpy.searchsorted(rotations, symbol_edges)
+        is_segment_start = numpy.ones(len(segments), dtype=bool)
+        is_segment_start[1:] = segments[1:] != segments[:-1]
+        indices = numpy.arange(len(segments))
+        position_in_segment = indices - numpy.maximum.accumulate(numpy.where(is_segment_start, indices, 0))
+        packet_starts = numpy.flatnonzero(is_segment_start | (position_in_segment % self._max_packet_length == 0))
+        packet_ends = numpy.append(packet_starts[1:], len(segments))
+
+        processed_edges = len(positions)
+        queued_symbols = 0
+        self._pending_packet_length = 0
+        for packet_start, packet_end in zip(packet_starts, packet_ends):
+            segment = segments[packet_start]
+            packet_offset = int(symbol_offsets[packet_start])
+            if packet_end - packet_start == self._max_packet_length:
+                rotation_edge = symbol_edges[packet_end - 1]
+            elif segment < len(rotations):
+                rotation_edge = rotations[segment]
+            else:
+                self._pending_packet_length = packet_end - packet_start
+                self._pending_packet[:self._pending_packet_length] = packet_symbols[packet_start:packet_end]
+                self._pending_packet_offset = packet_offset
+                break
+            self.output_queue.push(packet_symbols[packet_start:packet_end], packet_offset)
+            queued_symbols += packet_end - packet_start
+            if queued_symbols > max_symbols:
+                processed_edges = rotation_edge + 1
+                break
+
+        self._recent_positions = recent_positions[processed_edges:processed_edges + len(self._recent_positions)].copy()
+        last_edge = processed_edges - 1
+        last_rising_edge = last_edge if is_rising[last_edge] else last_edge - 1
+        last_falling_edge = last_edge if is_falling[last_edge] else last_edge - 1
+        if last_rising_edge >= 0:
+            self._last_positive_edge = int(positions[last_rising_edge])
+        if last_falling_edge >= 0:
+            self._last_negative_edge = int(positions[last_falling_edge]) if is_valid_pulse[last_falling_edge] else None
+        if is_valid_gap[last_edge]:
+            self._pending_symbol = int(symbols[last_edge])
+        elif is_falling[last_edge] or has_gap[last_edge] or last_edge > 0:
+            self._pending_symbol = None
+        return processed_edges
+
+    def finish_timed_out_packet(self, position):
+        """Finish the current packet if no further symbol can follow the last edge at the given position."""
+        if self._last_negative_edge is not None and self._last_negative_edge > (self._last_positive_edge or -1):
+            gap = position - self._last_negative_edge
+            if gap > max(self._samples_per_gap) + self._max_deviation:
+                self.finish_packet()
+        elif self._last_positive_edge is not None and self._last_positive_edge > (self._last_negative_edge or -1):
+            pulse = position - self._last_positive_edge
+            if pulse > self._samples_per_pulse + self._max_deviation:
+                self.finish_packet()
+
+    def finish_packet(self):
+        if self._pending_packet_length:
+            self.output_queue.push(self._pending_packet[:self._pending_packet_length], self._pending_packet_offset)
+            self._pending_packet_length = 0
+
+
+class PacketRingBuffer:
+    """
+    FIFO queue of int8 packets with a fixed memory limit. The symbols of all packets are stored back to back in a
+    preallocated ring buffer, the packet boundaries as a queue of packet lengths, along with the sample offset of
+    each packet. If a new packet does not fit, either the oldest packets or the new packet are dropped, depending on
+    the overflow policy.
+    """
+
+    def __init__(self, capacity, overflow_policy=OverflowPolicy.DROP_OLDEST):
+        self._buffer = numpy.zeros(capacity, dtype=numpy.int8)
+        self._packet_lengths = collections.deque()
+        self._packet_offsets = collections.deque()
+        self._overflow_policy = overflow_policy
+        self._head = 0
+        self.queued_symbols = 0
+        self.dropped_packets = 0
+
+    def __len__(self):
+        return len(self._packet_lengths)
+
+    def push(self, packet, offset=None):
+        length = len(packet)
+        capacity = len(self._buffer)
+        if length > capacity or \
+                (self._overflow_policy == OverflowPolicy.DROP_NEWEST and self.queued_symbols + length > capacity):
+            self.dropped_packets += 1
+            return
+        while self.queued_symbols + length > capacity:
+            self._drop_oldest()
+
+        tail = (self._head + self.queued_symbols) % capacity
+        head_length = min(length, capacity - tail)
+        self._buffer[tail:tail + head_length] = packet[:head_length]
+        self._buffer[:length - head_length] = packet[head_length:]
+        self._packet_lengths.append(length)
+        self._packet_offsets.append(offset)
+        self.queued_symbols += length
+
+    def peek_length(self):
+        return self._packet_lengths[0]
+
+    def peek_offset(self):
+        return self._packet_offsets[0]
+
+    def pop(self, out):
+        """Copy the oldest packet to the beginning of out and remove it from the queue. Returns its length."""
+        length = self._packet_lengths.popleft()
+        head_length = min(length, len(self._buffer) - self._head)
+        out[:head_length] = self._buffer[self._head:self._head + head_length]
+        out[head_length:length] = self._buffer[:length - head_length]
+        self._advance(length)
+        return length
+
+    def _drop_oldest(self):
+        self._advance(self._packet_lengths.popleft())
+        self.dropped_packets += 1
+
+    def _advance(self, length):
+        self._packet_offsets.popleft()
+        self._head = (self._head + length) % len(self._buffer)
+        self.queued_symbols -= length
+
+
+def iterate_results(result):
+    """
+    Results of a message processor snippet: nothing for None, all items of a generator, or the result itself.
+    """
+    if result is None:
+        return ()
+    if isinstance(result, types.GeneratorType):
+        return result
+    return result,
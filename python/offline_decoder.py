@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2026 Thomas Reifenberger.
+#
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+#
+"""
+Decoding of recorded samples without a flowgraph, using the same logic as the binary_tagger, binary_symbol_sync and
+binary_dppm_decoder blocks. Transmissions are found first, then each of them is decoded on its own.
+"""
+import concurrent.futures
+import itertools
+
+import numpy
+
+try:
+    from .kernels import TransmissionDetector
+    from .pipeline import dppm_packets, symbol_packets
+except ImportError:  # imported as a top level module, e.g. by the QA tests
+    from kernels import TransmissionDetector
+    from pipeline import dppm_packets, symbol_packets
+
+DEFAULT_CHUNK_SIZE = 1 << 24
+
+
+def load_samples(path):
+    """Memory-map a file with one int8 or thresholded uint8 sample per byte. Non-zero samples are signal."""
+    try:
+        return numpy.memmap(path, dtype=numpy.int8, mode='r')
+    except ValueError:  # empty files cannot be mapped
+        return numpy.zeros(0, dtype=numpy.int8)
+
+
+def find_transmissions(samples, max_quiet_samples=100, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield (start, end) of each transmission like binary_tagger would tag it. A transmission that is still going on
+    at the end of the samples ends there. Only chunk_size samples are scanned at once.
+    """
+    detector = TransmissionDetector(max_quiet_samples)
+    start = None
+    for offset in range(0, len(samples), chunk_size):
+        chunk = samples[offset:offset + chunk_size]
+        signal_positions = numpy.flatnonzero(chunk) + offset
+        for position, is_transmission in detector.process(signal_positions, signal_positions, offset + len(chunk)):
+            if is_transmission:
+                start = position
+            else:
+                yield start, position
+                start = None
+    if start is not None:
+        yield start, len(samples)
+
+
+def decode_symbols(transmission, position, samples_per_symbol=10, max_deviation=2, clock_smoothing_factor=0.5,
+                   max_zero_symbols=10, output_samples_per_symbol=1):
+    """
+    Decode a transmission that starts at the given position like binary_symbol_sync, see pipeline.symbol_packets.
+    Returns a list with a single (position, symbols) of all output samples, or an empty one.
+    """
+    return list(symbol_packets([(position, transmission, True)], samples_per_symbol, max_deviation,
+                               clock_smoothing_factor, max_zero_symbols, output_samples_per_symbol))
+
+
+def decode_dppm(transmission, position, samples_per_pulse=10, samples_per_gap=(10, 20), max_deviation=1,
+                max_packet_length=64, max_queued_symbols=65536):
+    """
+    Decode a transmission that starts at the given position like binary_dppm_decoder, see pipeline.dppm_packets.
+    The last packet ends with the transmission. Returns a list of (offset, packet), where offset is the start of the
+    packet.
+    """
+    return list(dppm_packets([(position, transmission, True)], samples_per_pulse, samples_per_gap, max_deviation,
+                             max_packet_length, max_queued_symbols))
+
+
+def decode_samples(samples, decode, max_quiet_samples=100, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield (offset, packet) for each packet in samples. decode is called as decode(transmission, position) for each
+    transmission and returns a list of (offset, packet), e.g. decode_symbols or decode_dppm with bound parameters.
+    """
+    for start, end in find_transmissions(samples, max_quiet_samples, chunk_size):
+        yield from decode(numpy.asarray(samples[start:end]), start)
+
+
+def find_split(samples, position, max_quiet_samples=100, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Find the first position not before the given one that binary_tagger would never put inside a transmission,
+    because it is preceded by more than max_quiet_samples zero samples. Decoding the samples before and after it
+    separately gives the same result as decoding them together. Returns len(samples) if there is no such position.
+    """
+    quiet_samples = max_quiet_samples + 1
+    start = max(position - quiet_samples, 0)
+    while start < len(samples):
+        chunk = samples[start:start + chunk_size + quiet_samples]
+        signal_positions = numpy.flatnonzero(chunk) + start
+        # the sample before the chunk is treated like a signal, so only gaps within the chunk are found
+        gap_starts = numpy.concatenate(([start - 1], signal_positions)) + 1
+        gap_ends = numpy.concatenate((signal_positions, [start + len(chunk)]))
+        quiet_gaps = numpy.flatnonzero(gap_ends - gap_starts >= quiet_samples)
+        if len(quiet_gaps) > 0:
+            return int(gap_starts[quiet_gaps[0]]) + quiet_samples
+        start += chunk_size
+    return len(samples)
+
+
+def split_samples(samples, parts, max_quiet_samples=100, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Split samples into up to the given number of (start, end) ranges of about equal size, which can be decoded
+    independently. See find_split.
+    """
+    ranges = []
+    start = 0
+    for part in range(1, parts):
+        if start >= len(samples):
+            break
+        end = find_split(samples, max(len(samples) * part // parts, start + 1), max_quiet_samples, chunk_size)
+        ranges.append((start, end))
+        start = end
+    if start < len(samples):
+        ranges.append((start, len(samples)))
+    return ranges
+
+
+def _decode_file_range(path, start, end, decode, max_quiet_samples, chunk_size):
+    samples = load_samples(path)[start:end]
+    return [(start + offset, packet) for offset, packet in
+            decode_samples(samples, decode, max_quiet_samples, chunk_size)]
+
+
+def decode_file(path, decode, max_quiet_samples=100, chunk_size=DEFAULT_CHUNK_SIZE, jobs=1, parts_per_job=4):
+    """
+    Yield (offset, packet) for each packet in a file like decode_samples. With more than one job, the file is
+    split at quiet gaps into jobs * parts_per_job ranges, which are decoded in a process pool. Each process maps
+    the file on its own. The packets are still yielded in the order of their offset.
+    """
+    samples = load_samples(path)
+    if jobs <= 1:
+        yield from decode_samples(samples, decode, max_quiet_samples, chunk_size)
+        return
+    ranges = split_samples(samples, jobs * parts_per_job, max_quiet_samples, chunk_size)
+    if not ranges:
+        return
+    starts, ends = zip(*ranges)
+    with concurrent.futures.ProcessPoolExecutor(jobs) as executor:
+        for packets in executor.map(_decode_file_range, itertools.repeat(path), starts, ends,
+                                    itertools.repeat(decode), itertools.repeat(max_quiet_samples),
+                                    itertools.repeat(chunk_size)):
+            yield from packets
+
+
+def format_packet(offset, packet, bytes_per_sep=1):
+    return f'{offset} {bytes.hex(packet.astype(numpy.uint8).tobytes(), " ", bytes_per_sep)}'
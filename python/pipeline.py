@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2026 Thomas Reifenberger.
+#
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+#
+"""
+Generator pipeline to decode an endless stream of samples inside another Python program, without a flowgraph:
+chunks of samples -> bursts -> packets -> messages. Each stage is a generator that pulls from the previous one only
+when its own consumer asks for the next item. So nothing is read ahead, and the memory use is bounded by the chunk
+size and max_burst_samples.
+
+    chunks = read_chunks(sys.stdin.buffer)
+    for message in messages(dppm_packets(bursts(chunks), samples_per_pulse=10), process):
+        ...
+"""
+import numpy
+
+try:
+    from .kernels import PACKET_LENGTH_TAG_KEY, PACKET_OFFSET_KEY, DppmDecoder, OverflowPolicy, SymbolSynchronizer, \
+        TransmissionDetector, iterate_results
+except ImportError:  # imported as a top level module, e.g. by the QA tests
+    from kernels import PACKET_LENGTH_TAG_KEY, PACKET_OFFSET_KEY, DppmDecoder, OverflowPolicy, SymbolSynchronizer, \
+        TransmissionDetector, iterate_results
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+DEFAULT_MAX_BURST_SAMPLES = 1 << 20
+
+
+def read_chunks(file, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield chunks of up to chunk_size int8 samples read from a binary file object, until it is exhausted."""
+    while True:
+        data = file.read(chunk_size)
+        if not data:
+            return
+        yield numpy.frombuffer(data, dtype=numpy.int8)
+
+
+def split_chunks(chunks, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield the samples of arbitrarily large chunks in chunks of up to chunk_size samples."""
+    for chunk in chunks:
+        for start in range(0, len(chunk), chunk_size):
+            yield chunk[start:start + chunk_size]
+
+
+def bursts(chunks, max_quiet_samples=100, max_burst_samples=DEFAULT_MAX_BURST_SAMPLES):
+    """
+    Yield (offset, samples, is_end) for each transmission like binary_tagger would tag it, where offset counts the
+    samples of all chunks. A transmission that is longer than max_burst_samples is split into several bursts, to bound
+    the memory use, and is_end is only True for the last of them. One that is still going on when the chunks are
+    exhausted ends there.
+    """
+    detector = TransmissionDetector(max_quiet_samples)
+    burst_start = None
+    # copies of the samples from burst_start up to buffered, as the producer might reuse its chunks
+    burst_parts = []
+    buffered = 0
+    position = 0
+    for chunk in chunks:
+        chunk_start = position
+        position += len(chunk)
+        for event_position, is_transmission in detector.find_bursts(chunk):
+            if is_transmission:
+                burst_start = buffered = event_position
+                burst_parts = []
+            else:
+                if event_position > buffered:
+                    burst_parts.append(chunk[buffered - chunk_start:event_position - chunk_start])
+                # the quiet gap before the end might have started in a previous chunk
+                samples = numpy.concatenate(burst_parts)[:max(0, event_position - burst_start)]
+                yield from _split_burst(burst_start, samples, max_burst_samples)
+                burst_start = None
+        if burst_start is None:
+            continue
+        burst_parts.append(numpy.array(chunk[buffered - chunk_start:]))
+        buffered = position
+        if buffered - burst_start >= max_burst_samples:
+            # only a remainder shorter than max_burst_samples is kept, the transmission might go on with it
+            complete_length = (buffered - burst_start) // max_burst_samples * max_burst_samples
+            samples = numpy.concatenate(burst_parts)
+            yield from _split_burst(burst_start, samples[:complete_length], max_burst_samples, is_end=False)
+            burst_start += complete_length
+            burst_parts = [samples[complete_length:].copy()]
+    if burst_start is not None:
+        yield from _split_burst(burst_start, numpy.concatenate(burst_parts), max_burst_samples)
+
+
+def _split_burst(offset, samples, max_burst_samples, is_end=True):
+    if is_end and len(samples) == 0:
+        # the previous bursts filled the transmission exactly, but its end must still be told
+        yield offset, samples, True
+    for start in range(0, len(samples), max_burst_samples):
+        end = start + max_burst_samples
+        yield offset + start, samples[start:end], is_end and end >= len(samples)
+
+
+def symbol_packets(bursts_, samples_per_symbol=10, max_deviation=2, clock_smoothing_factor=0.5, max_zero_symbols=10,
+                   output_samples_per_symbol=1):
+    """
+    Yield (offset, symbols) for each transmission, decoded like binary_symbol_sync, where offset is the start of the
+    transmission. The parameters are those of binary_symbol_sync. The bursts of a split transmission are decoded
+    with the same synchronizer, and their symbols are yielded together after the last one.
+    """
+    synchronizer = None
+    for offset, samples, is_end in bursts_:
+        if synchronizer is None:
+            synchronizer = SymbolSynchronizer(samples_per_symbol, max_deviation, clock_smoothing_factor,
+                                              max_zero_symbols, output_samples_per_symbol)
+            transmission_offset = offset
+            parts = []
+        parts.append(synchronizer.sync_symbols(samples))
+        if is_end:
+            # enough zeros for the clock to lose its lock, like in a stream
+            padding = (max_zero_symbols + 2) * (samples_per_symbol + max_deviation) + 1
+            parts.append(synchronizer.sync_symbols(numpy.zeros(padding, dtype=numpy.int8)))
+            synchronizer = None
+            symbols = numpy.concatenate(parts)
+            if len(symbols) > 0:
+                yield transmission_offset, symbols
+
+
+def dppm_packets(bursts_, samples_per_pulse=10, samples_per_gap=(10, 20), max_deviation=1, max_packet_length=64,
+                 max_queued_symbols=65536):
+    """
+    Yield (offset, packet) for each DPPM packet in the bursts, where offset is the start of the packet like in the
+    PDUs of binary_dppm_decoder. The parameters are those of binary_dppm_decoder. The bursts of a split transmission
+    are decoded with the same decoder, and its last packet ends with the transmission.
+    """
+    decoder = None
+    for offset, samples, is_end in bursts_:
+        if decoder is None:
+            decoder = DppmDecoder(samples_per_pulse, samples_per_gap, max_deviation, max_packet_length,
+                                  max_queued_symbols, OverflowPolicy.DROP_OLDEST)
+            # the transmission starts with a signal, so the zero sample before it is needed to see the first edge
+            decoder.decode_dppm(numpy.zeros(1, dtype=numpy.int8))
+            transmission_offset = offset - 1
+        packets = decoder.decode_dppm(samples)
+        if is_end:
+            decoder.finish_packet()
+            packets.extend(decoder.pop_packets())
+            decoder = None
+        for packet_offset, packet in packets:
+            yield transmission_offset + packet_offset, packet
+
+
+def messages(packets, process):
+    """
+    Yield the results of process(tags, data) for each packet, like binary_message_processor with PDU input does.
+    tags holds the offset and length of the packet, data its symbols as uint8 array. process can return None for no
+    result, a single result, or a generator of results.
+    """
+    for offset, packet in packets:
+        tags = {PACKET_OFFSET_KEY: offset, PACKET_LENGTH_TAG_KEY: len(packet)}
+        yield from iterate_results(process(tags, packet.astype(numpy.uint8)))
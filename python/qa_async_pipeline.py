@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2026 Thomas Reifenberger.
+#
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+#
+import asyncio
+import os
+import threading
+
+import numpy
+from gnuradio import gr_unittest
+
+from async_pipeline import read_chunks_async, run_pipeline
+from pipeline import bursts, dppm_packets
+
+ZERO = (0,) * 10
+PULSE = (1,) * 10
+
+
+class qa_async_pipeline(gr_unittest.TestCase):
+
+    def test_reads_chunks_from_pipe(self):
+        # given
+        read_fd, write_fd = os.pipe()
+        writer = threading.Thread(target=self._write, args=(write_fd, [b'\x00\x01', b'\x02']))
+
+        async def read():
+            with os.fdopen(read_fd, 'rb') as file:
+                return [chunk.tolist() async for chunk in read_chunks_async(file, chunk_size=4)]
+
+        # when
+        writer.start()
+        chunks = asyncio.run(read())
+        writer.join()
+
+        # then
+        self.assertEqual(sum(chunks, []), [0, 1, 2])
+
+    def test_runs_pipeline(self):
+        # given
+        data = numpy.array(ZERO * 20 + PULSE + ZERO * 2 + PULSE + ZERO * 20 + PULSE + ZERO + PULSE + ZERO, dtype='int8')
+        results = []
+
+        async def consume(result):
+            offset, packet = result
+            results.append((offset, packet.tolist()))
+
+        # when
+        dropped_results = asyncio.run(run_pipeline(self._chunks(data, 16), self._stages, [consume]))
+
+        # then
+        self.assertEqual(results, [(200, [1]), (440, [0])])
+        self.assertEqual(dropped_results, [0])
+
+    def test_drops_results_of_slow_consumer(self):
+        # given
+        burst = numpy.array(PULSE + ZERO * 2 + PULSE + ZERO * 20, dtype='int8')
+        fast_results = []
+        slow_results = []
+        done = asyncio.Event()
+
+        async def consume_fast(result):
+            fast_results.append(result)
+
+        async def consume_slow(result):
+            slow_results.append(result)
+            await done.wait()
+
+        async def chunks():
+            for _ in range(10):
+                yield burst
+                # give the fast consumer time to keep up
+                await asyncio.sleep(0.01)
+
+        async def run():
+            pipeline = asyncio.ensure_future(
+                run_pipeline(chunks(), self._stages, [consume_fast, consume_slow], max_queued_results=2))
+            while len(fast_results) < 10:
+                await asyncio.sleep(0.01)
+            done.set()
+            return await pipeline
+
+        # when
+        dropped_results = asyncio.run(run())
+
+        # then
+        self.assertEqual(len(fast_results), 10)
+        self.assertEqual(len(slow_results), 3)
+        self.assertEqual(dropped_results, [0, 7])
+
+    def test_raises_error_of_stages(self):
+        # given
+        def stages(chunks):
+            for _ in chunks:
+                raise ValueError('broken')
+            yield
+
+        # when
+        with self.assertRaises(ValueError):
+            asyncio.run(run_pipeline(self._chunks(numpy.zeros(100, dtype='int8'), 10), stages, []))
+
+    @staticmethod
+    def _stages(chunks):
+        return dppm_packets(bursts(chunks, 100), samples_per_pulse=10, samples_per_gap=(10, 20))
+
+    @staticmethod
+    async def _chunks(data, chunk_size):
+        for start in range(0, len(data), chunk_size):
+            yield data[start:start + chunk_size]
+
+    @staticmethod
+    def _write(fd, parts):
+        with os.fdopen(fd, 'wb') as file:
+            for part in parts:
+                file.write(part)
+                file.flush()
+
+
+if __name__ == '__main__':
+    gr_unittest.run(qa_async_pipeline)
@@ -19,10 +19,11 @@
 # Boston, MA 02110-1301, USA.
 #
 
-from gnuradio import gr_unittest
+import pmt
+from gnuradio import gr_unittest, blocks
 
 from binary_dppm_decoder import binary_dppm_decoder
-from qa_common import BinaryBaseTest, ExpectedTag
+from qa_common import BinaryBaseTest, ExpectedTag, message_sink
 
 PULSE = (1,) * 3
 SHORT_GAP = (0,) * 5
@@ -51,6 +52,9 @@ class qa_binary_dppm_decoder(BinaryBaseTest):
             ({'samples_per_gap': (3,)}, 'samples_per_gap must have at least two elements'),
             ({'max_packet_length': 0}, 'max_packet_length must be a positive integer'),
             ({'max_packet_length': 1.}, 'max_packet_length must be a positive integer'),
+            ({'max_queued_symbols': 63}, 'max_queued_symbols must be an integer not smaller than max_packet_length'),
+            ({'max_queued_symbols': 64.}, 'max_queued_symbols must be an integer not smaller than max_packet_length'),
+            ({'stream_output': False}, 'stream_output or pdu_output must be enabled'),
         ]:
             with self.subTest(f'{parameters} -> {message}'):
                 with self.assertRaises(ValueError) as error:
@@ -236,15 +240,67 @@ class qa_binary_dppm_decoder(BinaryBaseTest):
         self.assertEqual(self.dst.data(), (1,) * 5)
         self._assert_tags([ExpectedTag(0, 'packet_len', 4), ExpectedTag(4, 'packet_len', 1)])
 
+    def test_holds_back_input_instead_of_dropping_packets_if_queue_is_full(self):
+        # given
+        data = ZERO + PULSE + LONG_GAP + PULSE + TRANSMISSION_BREAK + PULSE + SHORT_GAP + PULSE + TRANSMISSION_BREAK
+        self._setup_graph(data, max_packet_length=1, max_queued_symbols=1)
+
+        # when
+        self.tb.run()
+
+        # then
+        self.assertEqual(self.dst.data(), (1, 0))
+
+    def test_publishes_packets_as_pdus(self):
+        # given
+        data = ZERO + PULSE + SHORT_GAP + PULSE + LONG_GAP + PULSE + TRANSMISSION_BREAK + PULSE + LONG_GAP + PULSE + \
+               TRANSMISSION_BREAK
+        uut = self._setup_graph(data, pdu_output=True)
+        self.pdu_dst = message_sink()
+        self.tb.msg_connect(uut, 'pdu', self.pdu_dst, 'in')
+
+        # when
+        self.tb.run()
+
+        # then
+        self.assertEqual(self.dst.data(), (0, 1, 1))
+        self.assertEqual(self._pdus(), [({'packet_offset': 1, 'packet_len': 2}, [0, 1]),
+                                        ({'packet_offset': 39, 'packet_len': 1}, [1])])
+
+    def test_publishes_packets_as_pdus_without_stream_output(self):
+        # given
+        data = ZERO + PULSE + SHORT_GAP + PULSE + LONG_GAP + PULSE + TRANSMISSION_BREAK + PULSE + LONG_GAP + PULSE + \
+               TRANSMISSION_BREAK
+        src = blocks.vector_source_b(data)
+        uut = binary_dppm_decoder(samples_per_pulse=3, samples_per_gap=(5, 9), max_deviation=0,
+                                  stream_output=False, pdu_output=True)
+        self.pdu_dst = message_sink()
+        self.tb.connect(src, uut)
+        self.tb.msg_connect(uut, 'pdu', self.pdu_dst, 'in')
+
+        # when
+        self.tb.run()
+
+        # then
+        self.assertEqual(self._pdus(), [({'packet_offset': 1, 'packet_len': 2}, [0, 1]),
+                                        ({'packet_offset': 39, 'packet_len': 1}, [1])])
+
+    def _pdus(self):
+        return [(pmt.to_python(pmt.car(message)), list(pmt.u8vector_elements(pmt.cdr(message))))
+                for message in self.pdu_dst.messages]
+
     def _setup_graph(self, src_data, samples_per_pulse=3, samples_per_gap=(5, 9),
-                     max_deviation=0, max_packet_length=64):
+                     max_deviation=0, max_packet_length=64, max_queued_symbols=65536, pdu_output=False):
         uut = binary_dppm_decoder(
             samples_per_pulse=samples_per_pulse,
             samples_per_gap=samples_per_gap,
             max_deviation=max_deviation,
             max_packet_length=max_packet_length,
+            max_queued_symbols=max_queued_symbols,
+            pdu_output=pdu_output,
         )
         self._setup_graph_with_uut(src_data, uut)
+        return uut
 
 
 if __name__ == '__main__':
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2019 Thomas Reifenberger.
+#
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+#
+import pmt
+from gnuradio import gr_unittest, blocks
+
+from binary_dppm_pdu_decoder import binary_dppm_pdu_decoder
+from qa_common import BinaryBaseTest, message_sink
+
+PULSE = (1,) * 3
+SHORT_GAP = (0,) * 5
+LONG_GAP = (0,) * 9
+ZERO = (0,)
+TRANSMISSION_BREAK = (0,) * 15
+
+
+class qa_binary_dppm_pdu_decoder(BinaryBaseTest):
+
+    def test_zeroes_only_yield_no_messages(self):
+        # given
+        data = (0,) * 20
+        self._setup_graph(data)
+
+        # when
+        self.tb.run()
+
+        # then
+        self.assertEqual(self._packets(), [])
+
+    def test_receive_packet_as_pdu(self):
+        # given
+        data = ZERO + PULSE + SHORT_GAP + PULSE + LONG_GAP + PULSE + TRANSMISSION_BREAK
+        self._setup_graph(data)
+
+        # when
+        self.tb.run()
+
+        # then
+        self.assertEqual(len(self.dst.messages), 1)
+        self.assertEqual(pmt.to_python(pmt.car(self.dst.messages[0])), {'packet_offset': 1, 'packet_len': 2})
+        self.assertTrue(pmt.is_u8vector(pmt.cdr(self.dst.messages[0])))
+        self.assertEqual(self._packets(), [[0, 1]])
+
+    def test_receive_multiple_packets(self):
+        # given
+        data = ZERO + PULSE + LONG_GAP + PULSE + TRANSMISSION_BREAK + PULSE + SHORT_GAP + PULSE + TRANSMISSION_BREAK
+        self._setup_graph(data)
+
+        # when
+        self.tb.run()
+
+        # then
+        self.assertEqual(self._packets(), [[1], [0]])
+
+    def test_split_packets_at_max_packet_length(self):
+        # given
+        data = ZERO + PULSE + (LONG_GAP + PULSE + SHORT_GAP + PULSE) * 3 + TRANSMISSION_BREAK
+        self._setup_graph(data, max_packet_length=4)
+
+        # when
+        self.tb.run()
+
+        # then
+        self.assertEqual(self._packets(), [[1, 0, 1, 0], [1, 0]])
+
+    def test_signal_at_first_sample_is_not_a_pulse(self):
+        # given
+        data = PULSE + SHORT_GAP + PULSE + LONG_GAP + PULSE + TRANSMISSION_BREAK
+        self._setup_graph(data)
+
+        # when
+        self.tb.run()
+
+        # then
+        self.assertEqual(self._packets(), [[1]])
+
+    def _packets(self):
+        return [list(pmt.u8vector_elements(pmt.cdr(message))) for message in self.dst.messages]
+
+    def _setup_graph(self, src_data, samples_per_pulse=3, samples_per_gap=(5, 9), max_deviation=0,
+                     max_packet_length=64):
+        src = blocks.vector_source_b(src_data)
+        uut = binary_dppm_pdu_decoder(
+            samples_per_pulse=samples_per_pulse,
+            samples_per_gap=samples_per_gap,
+            max_deviation=max_deviation,
+            max_packet_length=max_packet_length,
+        )
+        self.dst = message_sink()
+        self.tb.connect(src, uut)
+        self.tb.msg_connect(uut, 'pdu', self.dst, 'in')
+
+
+if __name__ == '__main__':
+    gr_unittest.run(qa_binary_dppm_pdu_decoder)
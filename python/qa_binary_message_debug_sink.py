@@ -19,13 +19,20 @@
 # Boston, MA 02110-1301, USA.
 #
 import contextlib
+import glob
+import gzip
 import io
+import json
+import os
+import signal
+import tempfile
 import time
 
 import numpy
 import pmt
 from gnuradio import gr_unittest
-from binary_message_debug_sink import binary_message_debug_sink, OutputType
+from binary_message_debug_sink import binary_message_debug_sink, BufferOverflowPolicy, FileFormat, FlightRecorder, \
+    OutputSampler, OutputType, RECORDER_ENTRY_OVERHEAD, read_binary_records
 from qa_common import message_source, BinaryBaseTest
 
 
@@ -127,6 +134,189 @@ class qa_binary_message_debug_sink(BinaryBaseTest):
                 # then
                 self.assertEqual(out.getvalue(), expected_output)
 
+    def test_buffered_output(self):
+        # given
+        messages = [pmt.to_pmt('foo'), pmt.to_pmt(numpy.array([0, 1, 255], dtype='uint8')), pmt.to_pmt('bar')]
+        self._setup_graph(messages, buffered=True, buffer_size=4, overflow_policy=BufferOverflowPolicy.BLOCK)
+
+        # when
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self._run()
+
+        # then
+        self.assertEqual(out.getvalue(), 'foo\n00 01 ff\nbar\n')
+
+    def test_sampled_output(self):
+        messages = [pmt.to_pmt(word) for word in ['foo', 'bar', 'foo', 'baz', 'foo']]
+        for parameters, expected_output in [
+            (dict(every_nth=2), 'foo\nfoo\nfoo\n2 messages suppressed in the last 0 s\n'),
+            (dict(dedup_seconds=10), 'foo\nbar\nbaz\n2 messages suppressed in the last 0 s\n'),
+            (dict(max_rate=2), 'foo\nbar\n3 messages suppressed in the last 0 s\n'),
+        ]:
+            with self.subTest(parameters=parameters):
+                # sub-tests don't call tearDown / setUp
+                self.tearDown()
+                self.setUp()
+                # given
+                self._setup_graph(messages, **parameters)
+
+                # when
+                out = io.StringIO()
+                with contextlib.redirect_stdout(out):
+                    self._run()
+
+                # then
+                self.assertEqual(out.getvalue(), expected_output)
+
+    def test_deduplication_forgets_oldest_payloads_beyond_limit(self):
+        # given
+        sampler = OutputSampler(dedup_seconds=10, clock=lambda: 0, max_payloads=3)
+
+        # when
+        accepted = [sampler.accept(payload) for payload in [b'a', b'b', b'c', b'd', b'd', b'b', b'a']]
+
+        # then
+        self.assertEqual(accepted, [True, True, True, True, False, False, True])
+
+    def test_summary_is_printed_without_messages(self):
+        # given
+        self._setup_graph([pmt.to_pmt('foo')] * 3, every_nth=2, summary_seconds=0.05)
+
+        # when
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self.tb.start()
+            time.sleep(0.12)
+            self.tb.stop()
+            self.tb.wait()
+
+        # then
+        self.assertEqual(out.getvalue(), 'foo\nfoo\n1 messages suppressed in the last 0 s\n')
+
+    def test_stats_only_output(self):
+        # given
+        messages = [pmt.cons(pmt.PMT_NIL, pmt.to_pmt(numpy.array([1, 2, 3, i], dtype='uint8'))) for i in range(3)]
+        messages.append(pmt.cons(pmt.PMT_NIL, pmt.to_pmt(numpy.array([7] * 20, dtype='uint8'))))
+        self._setup_graph(messages, pdu_in=True, stats_only=True, stats_prefix_length=3)
+
+        # when
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self._run()
+
+        # then
+        self.assertRegex(out.getvalue(), r'^4 messages \([0-9.]+/s\), 4 PDUs, 0 raw, 0 not binary; '
+                                         r'lengths: <=4: 3, <=32: 1; top prefixes: 010203: 3, 070707: 1\n$')
+
+    def test_stats_are_reported_without_messages(self):
+        # given
+        self._setup_graph([], stats_only=True, stats_interval_seconds=0.05)
+
+        # when
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self.tb.start()
+            time.sleep(0.22)
+            self.tb.stop()
+            self.tb.wait()
+
+        # then
+        lines = out.getvalue().splitlines()
+        self.assertGreaterEqual(len(lines), 4)
+        for line in lines:
+            self.assertEqual(line, '0 messages (0.0/s), 0 PDUs, 0 raw, 0 not binary; lengths: -; top prefixes: -')
+
+    def test_flight_recorder_output(self):
+        # given
+        messages = [pmt.cons(pmt.PMT_NIL, pmt.to_pmt(numpy.array([i], dtype='uint8'))) for i in range(5)]
+        messages.append(pmt.cons(pmt.PMT_NIL, pmt.to_pmt(numpy.array([255, 255], dtype='uint8'))))
+        messages.append(pmt.cons(pmt.PMT_NIL, pmt.to_pmt(numpy.array([6], dtype='uint8'))))
+        self._setup_graph(messages, pdu_in=True, recorder_messages=3, dump_predicate='pmt.length(data) > 1')
+
+        # when
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self._run()
+
+        # then
+        self.assertEqual(out.getvalue(), 'Flight recorder dump (predicate): 3 messages\n03\n04\nff ff\n')
+
+    def test_flight_recorder_is_dumped_on_sigusr1(self):
+        # given
+        messages = [pmt.cons(pmt.PMT_NIL, pmt.to_pmt(numpy.array([i], dtype='uint8'))) for i in range(3)]
+        self._setup_graph(messages, pdu_in=True, recorder_messages=2, dump_on_sigusr1=True)
+
+        # when
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self.tb.start()
+            time.sleep(0.1)
+            os.kill(os.getpid(), signal.SIGUSR1)
+            time.sleep(0.1)
+            self.tb.stop()
+            self.tb.wait()
+
+        # then
+        self.assertEqual(out.getvalue(), 'Flight recorder dump (SIGUSR1): 2 messages\n01\n02\n')
+
+    def test_flight_recorder_is_bounded_by_bytes(self):
+        # given
+        recorder = FlightRecorder(max_bytes=10 * RECORDER_ENTRY_OVERHEAD)
+
+        # when
+        for i in range(1000):
+            recorder.add(i)
+        recorder.add('large', 100 * RECORDER_ENTRY_OVERHEAD)
+        recorder.add('small')
+
+        # then
+        self.assertEqual(recorder.take(), ['small'])
+        for i in range(1000):
+            recorder.add(i, RECORDER_ENTRY_OVERHEAD)
+        self.assertEqual(recorder.take(), list(range(995, 1000)))
+
+    def test_json_lines_file_output(self):
+        # given
+        metadata = pmt.to_pmt({'packet_offset': 42, 'packet_len': 3})
+        messages = [pmt.cons(metadata, pmt.to_pmt(numpy.array([0, 1, 255], dtype='uint8')))]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'packets.jsonl')
+            self._setup_graph(messages, pdu_in=True, file_path=path)
+
+            # when
+            self._run()
+
+            # then
+            with open(path) as file:
+                records = [json.loads(line) for line in file]
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]['offset'], 42)
+        self.assertEqual(records[0]['metadata'], {'packet_offset': 42, 'packet_len': 3})
+        self.assertEqual(records[0]['data'], '0001ff')
+        self.assertAlmostEqual(records[0]['timestamp'], time.time(), delta=10)
+
+    def test_rotated_binary_file_output(self):
+        # given
+        messages = [pmt.cons(pmt.PMT_NIL, pmt.to_pmt(numpy.array([i, 1, 255], dtype='uint8'))) for i in range(10)]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'packets.bin')
+            self._setup_graph(messages, pdu_in=True, file_path=path, file_format=FileFormat.BINARY, buffer_size=1,
+                              overflow_policy=BufferOverflowPolicy.BLOCK, rotate_bytes=100, compress=True)
+
+            # when
+            self._run()
+
+            # then
+            records = []
+            for rotated_path in glob.glob(path + '.*.gz'):
+                with gzip.open(rotated_path) as file:
+                    records.extend(read_binary_records(file))
+            with open(path, 'rb') as file:
+                records.extend(read_binary_records(file))
+        self.assertEqual(sorted(data for _, _, _, data in records), [bytes([i, 1, 255]) for i in range(10)])
+        self.assertEqual([(offset, tags) for offset, _, tags, _ in records], [(None, {})] * 10)
+
     def _run(self):
         self.tb.start()
         time.sleep(0.001)
@@ -134,9 +324,10 @@ class qa_binary_message_debug_sink(BinaryBaseTest):
         self.tb.wait()
 
     def _setup_graph(self, src_messages, pdu_in=False, output=OutputType.RAW, binary_output=OutputType.HEX,
-                     bytes_per_sep=1):
+                     bytes_per_sep=1, **kwargs):
         src = message_source(src_messages)
-        uut = binary_message_debug_sink(output=output, binary_output=binary_output, bytes_per_sep=bytes_per_sep)
+        uut = binary_message_debug_sink(output=output, binary_output=binary_output, bytes_per_sep=bytes_per_sep,
+                                        **kwargs)
         self.tb.msg_connect(src, 'out', uut, 'pdu_in' if pdu_in else 'in')
 
 
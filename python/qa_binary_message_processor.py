@@ -25,7 +25,7 @@ import time
 import numpy
 import pmt
 from gnuradio import gr_unittest
-from binary_message_processor import binary_message_processor, MessageType
+from binary_message_processor import binary_message_processor, MessageType, OverrunPolicy, WorkerType
 from qa_common import message_source, BinaryBaseTest, message_sink
 
 VECTOR = numpy.array([0, 1, 2], dtype='uint8')
@@ -81,6 +81,15 @@ class qa_binary_message_processor(BinaryBaseTest):
                 pmt.cons(pmt.to_pmt({'foo': 'bar'}), pmt.to_pmt(numpy.array([0, 1, 2], dtype='uint8'))),
                 pmt.cons(pmt.to_pmt({'foo': 'bar'}), pmt.to_pmt(numpy.array([0, 1, 2], dtype='uint8'))),
                 'return tags, data',
+        ), (
+                MessageType.PDU_VIEW, MessageType.PDU,
+                pmt.cons(pmt.to_pmt({'foo': 'bar'}), pmt.to_pmt(numpy.array([0, 1, 2], dtype='uint8'))),
+                pmt.cons(pmt.to_pmt({'foo': 'bar'}), pmt.to_pmt(numpy.array([0, 1, 2], dtype='uint8'))),
+                'return tags, data',
+        ), (
+                MessageType.PDU_VIEW, MessageType.PYTHON,
+                pmt.cons(pmt.PMT_NIL, pmt.to_pmt(VECTOR)), pmt.to_pmt(VECTOR),
+                'return data',
         )]:
             with self.subTest(in_type=in_type, out_type=out_type):
                 # sub-tests don't call tearDown / setUp
@@ -173,6 +182,169 @@ class qa_binary_message_processor(BinaryBaseTest):
         # then
         self.assertEqual(out.getvalue(), '6\n')
 
+    def test_changes_tags_of_pdu_view(self):
+        # given
+        code = 'tags["length"] = len(data)\ndel tags["foo"]\nreturn tags, data'
+        pdu = pmt.cons(pmt.to_pmt({'foo': 'bar', 'baz': 1}), pmt.to_pmt(VECTOR))
+        self._setup_graph([pdu], in_type=MessageType.PDU_VIEW, out_type=MessageType.PDU, code=code)
+
+        # when
+        self._run()
+
+        # then
+        self.assertMessages([pmt.cons(pmt.to_pmt({'baz': 1, 'length': 3}), pmt.to_pmt(VECTOR))])
+
+    def test_processes_batch_of_pdus(self):
+        # given
+        code = 'return [int(stacked_data.sum()), len(batch), batch[0][0]["foo"]]'
+        pdu = pmt.cons(pmt.to_pmt({'foo': 'bar'}), pmt.to_pmt(VECTOR))
+        self._setup_graph([pdu] * 3, in_type=MessageType.PDU, out_type=MessageType.PYTHON, code=code, batch_size=3)
+
+        # when
+        self._run()
+
+        # then
+        self.assertMessages([pmt.to_pmt(9), pmt.to_pmt(3), pmt.to_pmt('bar')])
+
+    def test_does_not_stack_data_of_different_length(self):
+        # given
+        code = 'return [stacked_data is None]'
+        pdus = [pmt.cons(pmt.PMT_NIL, pmt.to_pmt(VECTOR)), pmt.cons(pmt.PMT_NIL, pmt.to_pmt(VECTOR[:2])),
+                pmt.cons(pmt.PMT_NIL, pmt.to_pmt(VECTOR))]
+        self._setup_graph(pdus, in_type=MessageType.PDU, out_type=MessageType.PYTHON, code=code, batch_size=2)
+
+        # when
+        self._run()
+
+        # then the last message is processed alone when the flowgraph stops
+        self.assertMessages([pmt.to_pmt(True), pmt.to_pmt(False)])
+
+    def test_processes_incomplete_batch_after_timeout(self):
+        # given
+        code = 'yield len(batch)'
+        self._setup_graph([pmt.to_pmt('foo'), pmt.to_pmt('bar')], in_type=MessageType.PYTHON,
+                          out_type=MessageType.PYTHON, code=code, batch_size=100, batch_timeout_ms=10)
+
+        # when
+        self.tb.start()
+        time.sleep(0.1)
+        messages = list(self.dst.messages)
+        self.tb.stop()
+        self.tb.wait()
+
+        # then
+        self.assertEqual([pmt.to_python(message) for message in messages], [2])
+
+    def test_processes_in_workers_in_order(self):
+        for worker_type in [WorkerType.THREAD, WorkerType.PROCESS]:
+            with self.subTest(worker_type=worker_type):
+                # sub-tests don't call tearDown / setUp
+                self.tearDown()
+                self.setUp()
+                # given
+                code = 'import time\ntime.sleep(0.05 if message == 0 else 0)\nreturn message'
+                self._setup_graph([pmt.to_pmt(i) for i in range(5)], in_type=MessageType.PYTHON,
+                                  out_type=MessageType.PYTHON, code=code, workers=4, worker_type=worker_type)
+
+                # when
+                self._run()
+
+                # then
+                self.assertMessages([pmt.to_pmt(i) for i in range(5)])
+
+    def test_processes_in_worker_threads_out_of_order(self):
+        # given
+        code = 'import time\ntime.sleep(0.05 if message == 0 else 0)\nreturn message'
+        self._setup_graph([pmt.to_pmt(0), pmt.to_pmt(1)], in_type=MessageType.PYTHON, out_type=MessageType.PYTHON,
+                          code=code, workers=2, ordered_output=False)
+
+        # when
+        self._run()
+
+        # then
+        self.assertMessages([pmt.to_pmt(1), pmt.to_pmt(0)])
+
+    def test_processes_async_snippets_concurrently(self):
+        # given
+        code = 'import asyncio\nawait asyncio.sleep(0.05 if message == 0 else 0)\nreturn message'
+        self._setup_graph([pmt.to_pmt(i) for i in range(5)], in_type=MessageType.PYTHON, out_type=MessageType.PYTHON,
+                          code=code, max_concurrency=5)
+
+        # when
+        self._run()
+
+        # then
+        self.assertMessages([pmt.to_pmt(i) for i in range(5)])
+
+    def test_yields_messages_from_async_snippets(self):
+        # given
+        code = 'import asyncio\nfor word in message.split():\n    await asyncio.sleep(0)\n    yield word'
+        self._setup_graph([pmt.to_pmt('foo bar')], in_type=MessageType.PYTHON, out_type=MessageType.PYTHON, code=code)
+
+        # when
+        self._run()
+
+        # then
+        self.assertMessages([pmt.to_pmt('foo'), pmt.to_pmt('bar')])
+
+    def test_cancels_async_snippets_still_running_at_stop(self):
+        # given
+        code = 'import asyncio\nawait asyncio.sleep(1000 if message == 1 else 0)\nreturn message'
+        self._setup_graph([pmt.to_pmt(i) for i in range(3)], in_type=MessageType.PYTHON, out_type=MessageType.PYTHON,
+                          code=code, ordered_output=False, time_budget_ms=50)
+
+        # when
+        start = time.perf_counter()
+        self.tb.start()
+        time.sleep(0.1)
+        self.tb.stop()
+        self.tb.wait()
+
+        # then
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertMessages([pmt.to_pmt(0), pmt.to_pmt(2)])
+
+    def test_moves_overrunning_messages_to_slow_lane(self):
+        for overrun_policy, expected in [(OverrunPolicy.SLOW_LANE, [0, 2, 3, 1]), (OverrunPolicy.ABANDON, [0, 2, 3])]:
+            with self.subTest(overrun_policy=overrun_policy):
+                # sub-tests don't call tearDown / setUp
+                self.tearDown()
+                self.setUp()
+                # given
+                code = 'import time\ntime.sleep(0.2 if message == 1 else 0)\nreturn message'
+                self._setup_graph([pmt.to_pmt(i) for i in range(4)], in_type=MessageType.PYTHON,
+                                  out_type=MessageType.PYTHON, code=code, time_budget_ms=50,
+                                  overrun_policy=overrun_policy)
+
+                # when
+                self.tb.start()
+                time.sleep(0.3)
+                self.tb.stop()
+                self.tb.wait()
+
+                # then
+                self.assertMessages([pmt.to_pmt(i) for i in expected])
+
+    def test_drops_messages_if_slow_lane_is_full(self):
+        # given
+        code = 'import time\ntime.sleep(0.2 if message == 1 else 0)\nreturn message'
+        uut = self._setup_graph([pmt.to_pmt(i) for i in [1, 1, 2, 3]], in_type=MessageType.PYTHON,
+                                out_type=MessageType.PYTHON, code=code, time_budget_ms=50, slow_lane_size=2)
+
+        # when
+        self.tb.start()
+        time.sleep(0.4)
+        self.tb.stop()
+        self.tb.wait()
+
+        # then
+        self.assertMessages([pmt.to_pmt(1), pmt.to_pmt(1)])
+        self.assertEqual(uut.dropped_messages(), 2)
+
+    def test_rejects_raw_messages_for_worker_processes(self):
+        with self.assertRaises(ValueError):
+            binary_message_processor(in_type=MessageType.RAW, workers=2, worker_type=WorkerType.PROCESS)
+
     def assertMessages(self, expected_messages):
         expected_pythonic_messages = [pmt.to_python(message) for message in expected_messages]
         actual_pythonic_messages = [pmt.to_python(message) for message in self.dst.messages]
@@ -184,12 +356,13 @@ class qa_binary_message_processor(BinaryBaseTest):
         self.tb.stop()
         self.tb.wait()
 
-    def _setup_graph(self, src_messages, in_type=MessageType.RAW, out_type=MessageType.RAW, code='pass'):
+    def _setup_graph(self, src_messages, in_type=MessageType.RAW, out_type=MessageType.RAW, code='pass', **kwargs):
         src = message_source(src_messages)
-        uut = binary_message_processor(in_type=in_type, out_type=out_type, code=code)
+        uut = binary_message_processor(in_type=in_type, out_type=out_type, code=code, **kwargs)
         self.dst = message_sink()
         self.tb.msg_connect(src, 'out', uut, 'in')
         self.tb.msg_connect(uut, 'out', self.dst, 'in')
+        return uut
 
 
 if __name__ == '__main__':
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2026 Thomas Reifenberger.
+#
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+#
+import numpy
+from gnuradio import gr_unittest, blocks
+
+from binary_run_dppm_decoder import binary_run_dppm_decoder
+from binary_run_length_encoder import run_length_encode
+from qa_common import BinaryBaseTest, ExpectedTag
+
+PULSE = (1,) * 3
+SHORT_GAP = (0,) * 5
+LONG_GAP = (0,) * 9
+ZERO = (0,)
+TRAILING_ZEROS = LONG_GAP + ZERO
+TRANSMISSION_BREAK = (0,) * 15
+
+
+class qa_binary_run_dppm_decoder(BinaryBaseTest):
+
+    def test_zeroes_only_yield_no_output(self):
+        # given
+        self._setup_graph((0,) * 20)
+
+        # when
+        self.tb.run()
+
+        # then
+        self.assertEqual(self.dst.data(), ())
+
+    def test_receive_multiple_symbols(self):
+        # given
+        data = ZERO + PULSE + LONG_GAP + PULSE + SHORT_GAP + PULSE + LONG_GAP + PULSE + TRAILING_ZEROS
+        self._setup_graph(data)
+
+        # when
+        self.tb.run()
+
+        # then
+        self.assertEqual(self.dst.data(), (1, 0, 1))
+
+    def test_receive_multiple_symbols_with_pause(self):
+        # given
+        data = ZERO + PULSE + LONG_GAP + PULSE + TRANSMISSION_BREAK + PULSE + SHORT_GAP + PULSE + TRAILING_ZEROS
+        self._setup_graph(data)
+
+        # when
+        self.tb.run()
+
+        # then
+        self.assertEqual(self.dst.data(), (1, 0))
+        self._assert_tags([ExpectedTag(0, 'packet_len', 1), ExpectedTag(1, 'packet_len', 1)])
+
+    def test_receive_symbols_from_split_runs(self):
+        # given
+        runs = ((0, 1), (1, 2), (1, 1), (0, 4), (0, 5), (1, 3), (0, 5), (1, 3), (0, 10), (0, 5))
+        self._setup_graph_with_runs(runs)
+
+        # when
+        self.tb.run()
+
+        # then
+        self.assertEqual(self.dst.data(), (1, 0))
+        self._assert_tags([ExpectedTag(0, 'packet_len', 2)])
+
+    def test_receive_multiple_symbols_with_timing_deviation(self):
+        # given
+        data = ZERO + PULSE + (1,) + LONG_GAP + PULSE + SHORT_GAP + (0,) + PULSE + (0, 0, 0, 0) + PULSE + \
+               TRAILING_ZEROS + ZERO
+        self._setup_graph(data, max_deviation=1)
+
+        # when
+        self.tb.run()
+
+        # then
+        self.assertEqual(self.dst.data(), (1, 0, 0))
+
+    def test_receive_multiple_symbols_with_large_pause(self):
+        # given
+        data = ZERO + (PULSE + LONG_GAP) * 5 + \
+               PULSE + TRANSMISSION_BREAK * 100_000 + \
+               (PULSE + SHORT_GAP + PULSE + TRANSMISSION_BREAK * 10_000) * 5 + ZERO
+        self._setup_graph(data)
+
+        # when
+        self.tb.run()
+
+        # then
+        self.assertEqual(self.dst.data(), (1,) * 5 + (0,) * 5)
+
+    def test_packet_exceeding_max_packet_length(self):
+        # given
+        data = ZERO + (PULSE + LONG_GAP) * 5 + PULSE + TRAILING_ZEROS
+        self._setup_graph(data, max_packet_length=4)
+
+        # when
+        self.tb.run()
+
+        # then
+        self.assertEqual(self.dst.data(), (1,) * 5)
+        self._assert_tags([ExpectedTag(0, 'packet_len', 4), ExpectedTag(4, 'packet_len', 1)])
+
+    def _setup_graph(self, src_data, **kwargs):
+        levels, lengths = run_length_encode(numpy.array(src_data, dtype='int8'))
+        self._setup_graph_with_runs(zip(levels, lengths), **kwargs)
+
+    def _setup_graph_with_runs(self, runs, samples_per_pulse=3, samples_per_gap=(5, 9), max_deviation=0,
+                               max_packet_length=64):
+        src = blocks.vector_source_i([int(value) for run in runs for value in run], False, 2)
+        uut = binary_run_dppm_decoder(
+            samples_per_pulse=samples_per_pulse,
+            samples_per_gap=samples_per_gap,
+            max_deviation=max_deviation,
+            max_packet_length=max_packet_length,
+        )
+        self.dst = blocks.vector_sink_b()
+        self.tb.connect(src, uut)
+        self.tb.connect(uut, self.dst)
+
+
+if __name__ == '__main__':
+    gr_unittest.run(qa_binary_run_dppm_decoder)
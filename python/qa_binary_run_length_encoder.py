@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2026 Thomas Reifenberger.
+#
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+#
+import numpy
+from gnuradio import gr_unittest, blocks
+
+from binary_run_length_encoder import binary_run_length_encoder, run_length_encode
+from qa_common import BinaryBaseTest
+
+
+class qa_binary_run_length_encoder(BinaryBaseTest):
+
+    def test_kernel_returns_runs(self):
+        # given
+        data = numpy.array((0, 0, 1, 1, 1, 0, -3, 2, 0, 0), dtype='int8')
+
+        # when
+        levels, lengths = run_length_encode(data)
+
+        # then
+        self.assertEqual(levels.tolist(), [0, 1, 0, 1, 0])
+        self.assertEqual(lengths.tolist(), [2, 3, 1, 2, 2])
+
+    def test_kernel_returns_nothing_for_empty_input(self):
+        # when
+        levels, lengths = run_length_encode(numpy.zeros(0, dtype='int8'))
+
+        # then
+        self.assertEqual(levels.tolist(), [])
+        self.assertEqual(lengths.tolist(), [])
+
+    def test_zeroes_only_yield_single_run(self):
+        # given
+        data = (0,) * 20
+        self._setup_graph(data)
+
+        # when
+        self.tb.run()
+
+        # then
+        self.assertEqual(self._runs(), [(0, 20)])
+
+    def test_yields_runs(self):
+        # given
+        data = (1, 1, 0, 0, 0) * 2 + (0,) * 100_000 + (1,) * 3
+        self._setup_graph(data)
+
+        # when
+        self.tb.run()
+
+        # then
+        self.assertEqual(self._runs(), [(1, 2), (0, 3), (1, 2), (0, 100_003), (1, 3)])
+
+    def _runs(self):
+        # runs may be split into several records of the same level
+        runs = []
+        data = self.dst.data()
+        for level, length in zip(data[0::2], data[1::2]):
+            if runs and runs[-1][0] == level:
+                runs[-1] = (level, runs[-1][1] + length)
+            else:
+                runs.append((level, length))
+        return runs
+
+    def _setup_graph(self, src_data):
+        src = blocks.vector_source_b(src_data)
+        uut = binary_run_length_encoder()
+        self.dst = blocks.vector_sink_i(2)
+        self.tb.connect(src, uut)
+        self.tb.connect(uut, self.dst)
+
+
+if __name__ == '__main__':
+    gr_unittest.run(qa_binary_run_length_encoder)
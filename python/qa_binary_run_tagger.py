@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2026 Thomas Reifenberger.
+#
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+#
+from gnuradio import gr_unittest, blocks
+
+from binary_run_tagger import binary_run_tagger
+from qa_common import ExpectedTag, BinaryBaseTest
+
+TEST_KEY = 'test_key'
+
+
+class qa_binary_run_tagger(BinaryBaseTest):
+
+    def test_zeroes_only_yield_no_tags(self):
+        # given
+        runs = ((0, 5), (0, 100))
+        self._setup_graph(runs)
+
+        # when
+        self.tb.run()
+
+        # then
+        self.assertEqual(self.dst.data(), self._flatten(runs))
+        self._assert_tags(())
+
+    def test_yields_starting_and_ending_tag(self):
+        # given
+        runs = ((0, 2), (1, 1), (0, 1), (1, 1), (0, 4), (1, 1), (0, 7))
+        self._setup_graph(runs, max_quiet_samples=4)
+
+        # when
+        self.tb.run()
+
+        # then
+        self.assertEqual(self.dst.data(), self._flatten(runs))
+        self._assert_tags((
+            ExpectedTag(1, TEST_KEY, True),
+            ExpectedTag(6, TEST_KEY, False),
+        ))
+
+    def test_yields_multiple_transmissions(self):
+        # given
+        runs = ((0, 2), (1, 5), (0, 3), (0, 1), (1, 1), (0, 2), (1, 2), (0, 1_000))
+        self._setup_graph(runs, max_quiet_samples=2)
+
+        # when
+        self.tb.run()
+
+        # then
+        self.assertEqual(self.dst.data(), self._flatten(runs))
+        self._assert_tags((
+            ExpectedTag(1, TEST_KEY, True),
+            ExpectedTag(2, TEST_KEY, False),
+            ExpectedTag(4, TEST_KEY, True),
+            ExpectedTag(7, TEST_KEY, False),
+        ))
+
+    @staticmethod
+    def _flatten(runs):
+        return tuple(value for run in runs for value in run)
+
+    def _setup_graph(self, runs, max_quiet_samples=100):
+        src = blocks.vector_source_i(self._flatten(runs), False, 2)
+        uut = binary_run_tagger(key=TEST_KEY, max_quiet_samples=max_quiet_samples)
+        self.dst = blocks.vector_sink_i(2)
+        self.tb.connect(src, uut)
+        self.tb.connect(uut, self.dst)
+
+
+if __name__ == '__main__':
+    gr_unittest.run(qa_binary_run_tagger)
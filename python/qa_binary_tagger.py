@@ -88,6 +88,23 @@ class qa_binary_tagger(BinaryBaseTest):
             ExpectedTag(19, TEST_KEY, False),
         ))
 
+    def test_yields_new_transmission_directly_after_quiet_period(self):
+        # given
+        data = (1, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0)
+        self._setup_graph(data, max_quiet_samples=2)
+
+        # when
+        self.tb.run()
+
+        # then
+        self.assertEqual(self.dst.data(), data)
+        self._assert_tags((
+            ExpectedTag(0, TEST_KEY, True),
+            ExpectedTag(6, TEST_KEY, False),
+            ExpectedTag(7, TEST_KEY, True),
+            ExpectedTag(10, TEST_KEY, False),
+        ))
+
     def test_yields_transmissions_for_large_number_of_samples(self):
         # given
         data = (0,) * 100_000 + (1, 0, 0, 1, 0, 0, 1, 1) + (0,) * 100_000
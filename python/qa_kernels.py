@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2026 Thomas Reifenberger.
+#
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+#
+import numpy
+from gnuradio import gr_unittest
+
+from kernels import DppmDecoder, EdgeDetector, OverflowPolicy, SymbolSynchronizer, TransmissionDetector
+
+PULSE = (1,) * 3
+SHORT_GAP = (0,) * 5
+LONG_GAP = (0,) * 9
+TRANSMISSION_BREAK = (0,) * 15
+
+
+class qa_kernels(gr_unittest.TestCase):
+
+    def test_find_bursts_in_chunks(self):
+        # given
+        detector = TransmissionDetector(max_quiet_samples=3)
+        chunks = [numpy.array(chunk, dtype='int8') for chunk in [(0, 0, 1), (0, 0, 0, 0, 1, 0), (0, 0, 0, 0, 0)]]
+
+        # when
+        bursts = [burst for chunk in chunks for burst in detector.find_bursts(chunk)]
+
+        # then
+        self.assertEqual(bursts, [(2, True), (6, False), (7, True), (11, False)])
+
+    def test_sync_symbols_in_chunks(self):
+        # given
+        synchronizer = SymbolSynchronizer(samples_per_symbol=4, max_deviation=1, clock_smoothing_factor=0.5,
+                                          max_zero_symbols=1, output_samples_per_symbol=1)
+        data = numpy.array((0, 0) + (1, 1, 0, 0) * 2 + (0, 0, 0, 0) + (1, 1, 0, 0) + (0,) * 12, dtype='int8')
+
+        # when
+        symbols = numpy.concatenate([synchronizer.sync_symbols(data[i:i + 5]) for i in range(0, len(data), 5)])
+
+        # then
+        self.assertEqual(symbols.tolist(), [1, 1, 0, 1, 0, 0])
+
+    def test_decode_dppm_in_chunks(self):
+        # given
+        decoder = DppmDecoder(samples_per_pulse=3, samples_per_gap=(5, 9), max_deviation=0, max_packet_length=64,
+                              max_queued_symbols=64, overflow_policy=OverflowPolicy.DROP_OLDEST)
+        data = numpy.array((0,) + PULSE + SHORT_GAP + PULSE + LONG_GAP + PULSE + TRANSMISSION_BREAK +
+                           PULSE + LONG_GAP + PULSE + TRANSMISSION_BREAK, dtype='int8')
+
+        # when
+        packets = [(offset, packet.tolist()) for i in range(0, len(data), 7)
+                   for offset, packet in decoder.decode_dppm(data[i:i + 7])]
+
+        # then
+        self.assertEqual(packets, [(1, [0, 1]), (39, [1])])
+
+    def test_decode_dppm_with_empty_chunks(self):
+        # given
+        decoder = DppmDecoder(samples_per_pulse=3, samples_per_gap=(5, 9), max_deviation=0, max_packet_length=64,
+                              max_queued_symbols=64, overflow_policy=OverflowPolicy.DROP_OLDEST)
+        data = numpy.array((0,) + PULSE + SHORT_GAP + PULSE + LONG_GAP + PULSE + TRANSMISSION_BREAK, dtype='int8')
+        empty = numpy.zeros(0, dtype='int8')
+
+        # when
+        packets = [(offset, packet.tolist()) for chunk in [empty, data[:4], empty, data[4:], empty]
+                   for offset, packet in decoder.decode_dppm(chunk)]
+
+        # then
+        self.assertEqual(packets, [(1, [0, 1])])
+
+    def test_drops_oldest_packet_if_queue_is_not_drained(self):
+        # given
+        decoder = self._decoder_with_stalled_consumer(OverflowPolicy.DROP_OLDEST)
+
+        # then
+        self.assertEqual([(offset, packet.tolist()) for offset, packet in decoder.pop_packets()], [(31, [0])])
+        self.assertEqual(decoder.output_queue.dropped_packets, 1)
+
+    def test_drops_newest_packet_if_queue_is_not_drained(self):
+        # given
+        decoder = self._decoder_with_stalled_consumer(OverflowPolicy.DROP_NEWEST)
+
+        # then
+        self.assertEqual([(offset, packet.tolist()) for offset, packet in decoder.pop_packets()], [(1, [1])])
+        self.assertEqual(decoder.output_queue.dropped_packets, 1)
+
+    @staticmethod
+    def _decoder_with_stalled_consumer(overflow_policy):
+        decoder = DppmDecoder(samples_per_pulse=3, samples_per_gap=(5, 9), max_deviation=0, max_packet_length=1,
+                              max_queued_symbols=1, overflow_policy=overflow_policy)
+        data = numpy.array((0,) + PULSE + LONG_GAP + PULSE + TRANSMISSION_BREAK +
+                           PULSE + SHORT_GAP + PULSE + TRANSMISSION_BREAK, dtype='int8')
+        positions, is_rising = EdgeDetector().process(data, 0)
+        # the consumer claims room for all symbols, but does not pop any packet from the queue
+        processed_edges = decoder.decode_edges(positions, is_rising, len(data))
+        assert processed_edges == len(positions)
+        return decoder
+
+
+if __name__ == '__main__':
+    gr_unittest.run(qa_kernels)
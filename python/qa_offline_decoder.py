@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2026 Thomas Reifenberger.
+#
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+#
+import functools
+import os
+import tempfile
+
+import numpy
+from gnuradio import gr_unittest
+
+from offline_decoder import decode_dppm, decode_file, decode_samples, decode_symbols, find_split, find_transmissions, \
+    format_packet, split_samples
+
+ONE = (1, 1, 1, 1, 1, 0, 0, 0, 0, 0)
+ZERO = (0,) * 10
+PULSE = (1,) * 10
+
+
+class qa_offline_decoder(gr_unittest.TestCase):
+
+    def test_finds_transmissions(self):
+        # given
+        data = numpy.array(ZERO * 2 + ONE * 3 + ZERO * 20 + ONE, dtype='int8')
+
+        # when
+        transmissions = list(find_transmissions(data, max_quiet_samples=100))
+
+        # then
+        self.assertEqual(transmissions, [(20, 145), (250, 260)])
+
+    def test_finds_transmissions_across_chunks(self):
+        # given
+        data = numpy.array(ZERO * 2 + ONE * 3 + ZERO * 20 + ONE, dtype='int8')
+
+        # when
+        transmissions = list(find_transmissions(data, max_quiet_samples=100, chunk_size=7))
+
+        # then
+        self.assertEqual(transmissions, [(20, 145), (250, 260)])
+
+    def test_finds_nothing_in_zeroes(self):
+        # when
+        transmissions = list(find_transmissions(numpy.zeros(1000, dtype='int8')))
+
+        # then
+        self.assertEqual(transmissions, [])
+
+    def test_decodes_symbols(self):
+        # given
+        data = numpy.array(ONE * 3 + ZERO + ONE, dtype='int8')
+
+        # when
+        packets = decode_symbols(data, 0, samples_per_symbol=10, max_deviation=1, max_zero_symbols=2)
+
+        # then
+        self.assertEqual([(position, packet.tolist()) for position, packet in packets], [(0, [1, 1, 1, 0, 1, 0, 0, 0])])
+
+    def test_decodes_dppm_packets(self):
+        # given
+        data = numpy.array(PULSE + ZERO + PULSE + ZERO * 2 + PULSE + ZERO + PULSE + ZERO, dtype='int8')
+
+        # when
+        packets = decode_dppm(data, 1000, samples_per_pulse=10, samples_per_gap=(10, 20), max_packet_length=2)
+
+        # then
+        self.assertEqual([(offset, packet.tolist()) for offset, packet in packets], [(1000, [0, 1]), (1050, [0])])
+
+    def test_decodes_samples_with_packet_offsets(self):
+        # given
+        data = numpy.array(ZERO * 20 + PULSE + ZERO * 2 + PULSE + ZERO * 20 + PULSE + ZERO + PULSE + ZERO * 2 + PULSE +
+                           ZERO + PULSE + ZERO, dtype='int8')
+        decode = functools.partial(decode_dppm, samples_per_pulse=10, samples_per_gap=(10, 20), max_packet_length=2)
+
+        # when
+        packets = [(offset, packet.tolist()) for offset, packet in decode_samples(data, decode, 100)]
+
+        # then
+        self.assertEqual(packets, [(200, [1]), (440, [0, 1]), (490, [0])])
+
+    def test_finds_split_after_quiet_gap(self):
+        # given
+        data = numpy.array(ONE * 3 + ZERO * 20 + ONE, dtype='int8')
+
+        # when
+        split = find_split(data, 10, max_quiet_samples=100, chunk_size=7)
+
+        # then
+        self.assertEqual(split, 126)
+
+    def test_finds_no_split_without_quiet_gap(self):
+        # given
+        data = numpy.array(ONE * 30, dtype='int8')
+
+        # when
+        split = find_split(data, 10, max_quiet_samples=100)
+
+        # then
+        self.assertEqual(split, 300)
+
+    def test_splits_samples_between_transmissions(self):
+        # given
+        data = numpy.array((ZERO * 20 + ONE * 3) * 4, dtype='int8')
+
+        # when
+        ranges = split_samples(data, 4, max_quiet_samples=100)
+
+        # then
+        self.assertEqual(ranges, [(0, 326), (326, 556), (556, 786), (786, 920)])
+        self.assertEqual([(start + transmission_start, start + transmission_end) for start, end in ranges
+                          for transmission_start, transmission_end in find_transmissions(data[start:end], 100)],
+                         list(find_transmissions(data, 100)))
+
+    def test_decodes_file_in_parallel(self):
+        # given
+        data = numpy.array((ZERO * 20 + PULSE + ZERO * 2 + PULSE + ZERO + PULSE + ZERO) * 10, dtype='int8')
+        decode = functools.partial(decode_dppm, samples_per_pulse=10, samples_per_gap=(10, 20))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'samples.bin')
+            data.tofile(path)
+
+            # when
+            packets = [(offset, packet.tolist()) for offset, packet in decode_file(path, decode, 100, jobs=2)]
+
+        # then
+        self.assertEqual(packets, [(200 + 270 * i, [1, 0]) for i in range(10)])
+
+    def test_formats_packet(self):
+        # when
+        line = format_packet(42, numpy.array((1, 0, 10), dtype='int8'))
+
+        # then
+        self.assertEqual(line, '42 01 00 0a')
+
+
+if __name__ == '__main__':
+    gr_unittest.run(qa_offline_decoder)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2026 Thomas Reifenberger.
+#
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+#
+import io
+
+import numpy
+from gnuradio import gr_unittest
+
+from pipeline import bursts, dppm_packets, messages, read_chunks, split_chunks, symbol_packets
+
+ONE = (1, 1, 1, 1, 1, 0, 0, 0, 0, 0)
+ZERO = (0,) * 10
+PULSE = (1,) * 10
+
+
+class qa_pipeline(gr_unittest.TestCase):
+
+    def test_reads_chunks(self):
+        # given
+        file = io.BytesIO(bytes(range(10)))
+
+        # when
+        chunks = [chunk.tolist() for chunk in read_chunks(file, chunk_size=4)]
+
+        # then
+        self.assertEqual(chunks, [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]])
+
+    def test_finds_bursts_across_chunks(self):
+        # given
+        data = numpy.array(ZERO * 2 + ONE * 3 + ZERO * 20 + ONE, dtype='int8')
+
+        # when
+        result = [(offset, len(samples), is_end) for offset, samples, is_end in bursts(split_chunks([data], 7), 100)]
+
+        # then
+        self.assertEqual(result, [(20, 125, True), (250, 10, True)])
+        self.assertEqual([samples.tolist() for offset, samples, _ in bursts([data], 100) if offset == 250], [list(ONE)])
+
+    def test_splits_long_bursts(self):
+        # given
+        data = numpy.array(ONE * 10, dtype='int8')
+
+        # when
+        result = [(offset, len(samples), is_end) for offset, samples, is_end in
+                  bursts(split_chunks([data], 7), 100, 40)]
+
+        # then
+        self.assertEqual(result, [(0, 40, False), (40, 40, False), (80, 20, True)])
+
+    def test_does_not_read_ahead(self):
+        # given
+        chunks_read = []
+
+        def chunks():
+            for i in range(10):
+                chunks_read.append(i)
+                yield numpy.array(ONE + ZERO * 20, dtype='int8')
+
+        # when
+        first_burst = next(bursts(chunks(), 100))
+
+        # then
+        self.assertEqual(first_burst[0], 0)
+        self.assertEqual(chunks_read, [0])
+
+    def test_decodes_symbols(self):
+        # given
+        data = numpy.array(ONE * 3 + ZERO + ONE + ZERO * 20, dtype='int8')
+
+        # when
+        packets = [(offset, packet.tolist()) for offset, packet in
+                   symbol_packets(bursts([data], 100), samples_per_symbol=10, max_deviation=1, max_zero_symbols=2)]
+
+        # then
+        self.assertEqual(packets, [(0, [1, 1, 1, 0, 1, 0, 0, 0])])
+
+    def test_decodes_dppm_packets(self):
+        # given
+        data = numpy.array(ZERO * 20 + PULSE + ZERO * 2 + PULSE + ZERO * 20 + PULSE + ZERO + PULSE + ZERO, dtype='int8')
+
+        # when
+        packets = [(offset, packet.tolist()) for offset, packet in
+                   dppm_packets(bursts(split_chunks([data], 16), 100), samples_per_pulse=10, samples_per_gap=(10, 20))]
+
+        # then
+        self.assertEqual(packets, [(200, [1]), (440, [0])])
+
+    def test_decodes_dppm_packets_with_their_own_offset(self):
+        # given
+        data = numpy.array(PULSE + (ZERO + PULSE) * 3 + ZERO * 5 + PULSE + ZERO * 2 + PULSE + ZERO * 20, dtype='int8')
+
+        # when
+        packets = [(offset, packet.tolist()) for offset, packet in
+                   dppm_packets(bursts([data], 100), samples_per_pulse=10, samples_per_gap=(10, 20))]
+
+        # then
+        self.assertEqual(packets, [(0, [0, 0, 0]), (120, [1])])
+
+    def test_decodes_split_transmissions_as_a_whole(self):
+        # given
+        symbols = [0, 1, 1, 0, 1, 0, 0, 1] * 25
+        data = numpy.array(PULSE + sum((ZERO * (symbol + 1) + PULSE for symbol in symbols), ()) + ZERO * 20,
+                           dtype='int8')
+
+        for max_burst_samples in [100, 2048]:
+            with self.subTest(max_burst_samples=max_burst_samples):
+                # when
+                packets = [(offset, packet.tolist()) for offset, packet in
+                           dppm_packets(bursts(split_chunks([data], 16), 100, max_burst_samples),
+                                        samples_per_pulse=10, samples_per_gap=(10, 20), max_packet_length=256)]
+
+                # then
+                self.assertEqual(packets, [(0, symbols)])
+
+    def test_processes_messages(self):
+        # given
+        packets = [(200, numpy.array([1, 0], dtype='int8')), (440, numpy.array([0], dtype='int8'))]
+
+        def process(tags, data):
+            if len(data) > 1:
+                yield tags['packet_offset'], data.tolist()
+                yield tags['packet_len'], data.dtype
+
+        # when
+        result = list(messages(packets, process))
+
+        # then
+        self.assertEqual(result, [(200, [1, 0]), (2, numpy.uint8)])
+
+
+if __name__ == '__main__':
+    gr_unittest.run(qa_pipeline)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2026 Thomas Reifenberger.
+#
+# This is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 3, or (at your option)
+# any later version.
+#
+# This software is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this software; see the file COPYING.  If not, write to
+# the Free Software Foundation, Inc., 51 Franklin Street,
+# Boston, MA 02110-1301, USA.
+#
+"""
+Synthetic binary traffic for benchmarks and tests: bursts of OOK or DPPM symbols, separated by quiet periods so that a
+given fraction of the samples belongs to bursts.
+"""
+import numpy
+
+DENSITIES = (0.001, 0.01, 0.1, 0.5)
+
+
+def ook_burst(rng, symbols, samples_per_symbol=10):
+    """Burst of random OOK symbols, where a one is a pulse of half a symbol, starting and ending with a one."""
+    bits = rng.integers(0, 2, symbols)
+    bits[0] = bits[-1] = 1
+    symbol = numpy.zeros((2, samples_per_symbol), dtype=numpy.int8)
+    symbol[1, :samples_per_symbol // 2] = 1
+    return symbol[bits].ravel()
+
+
+def dppm_burst(rng, symbols, samples_per_pulse=10, samples_per_gap=(10, 20)):
+    """Burst of random DPPM symbols, each a pulse followed by the gap of the symbol, ending with a pulse."""
+    gaps = numpy.array(samples_per_gap)[rng.integers(0, len(samples_per_gap), symbols)]
+    lengths = numpy.empty(2 * symbols + 1, dtype=numpy.int64)
+    lengths[0::2] = samples_per_pulse
+    lengths[1::2] = gaps
+    levels = numpy.zeros(len(lengths), dtype=numpy.int8)
+    levels[0::2] = 1
+    return numpy.repeat(levels, lengths)
+
+
+def traffic(burst, samples, density, seed=0, symbols_per_burst=64, **parameters):
+    """
+    Samples made of bursts, created by burst(rng, symbols_per_burst, **parameters), separated by quiet periods
+    of random length. On average, the given fraction of the samples belongs to bursts. A density of 0 gives only
+    quiet samples.
+    """
+    rng = numpy.random.default_rng(seed)
+    result = numpy.zeros(samples, dtype=numpy.int8)
+    if density <= 0:
+        return result
+    position = 0
+    while True:
+        samples_of_burst = burst(rng, symbols_per_burst, **parameters)
+        mean_quiet_samples = len(samples_of_burst) * (1 - density) / density
+        position += int(rng.uniform(0.5, 1.5) * mean_quiet_samples) + 1
+        if position + len(samples_of_burst) > samples:
+            return result
+        result[position:position + len(samples_of_burst)] = samples_of_burst
+        position += len(samples_of_burst)